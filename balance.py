@@ -0,0 +1,320 @@
+# balance.py
+#
+# Simulador de balanceamento em lote: roda milhares de partidas sem janela
+# de um nível, em paralelo em todos os núcleos, com estratégias roteirizadas
+# de posicionamento de torres e sementes fixas. Agrega, por onda, vazamentos
+# (vidas perdidas), abates, dinheiro e taxa de sobrevivência, além da curva
+# de dinheiro ao longo do tempo simulado.
+#
+# Uso (a partir da raiz do projeto):
+#     python balance.py                                  # nível 1, todas as estratégias
+#     python balance.py -l 0 -n 5000 -s basic mixed -j 8
+#     python balance.py --json relatorio.json
+#
+# Para testar um balanceamento, edite LEVELS / ENEMY_REWARD / TOWER_COSTS /
+# UPGRADE_COSTS e rode de novo com as mesmas sementes: os resultados mudam
+# só pelo que foi alterado.
+
+import os
+import sys
+import json
+import time
+import random
+import argparse
+from multiprocessing import Pool
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import paths
+from config import SIM_TICK_RATE
+from levels import LEVELS, wave_size
+from occupancy import OccupancyGrid
+from towers import BasicTower, SniperTower
+from simulation import Simulation, TICK_MS
+
+# Decisões da estratégia a cada DECISION_TICKS ticks (0,5 s de simulação)
+DECISION_TICKS = SIM_TICK_RATE // 2
+# Distância (px base) dos pontos candidatos ao eixo do caminho
+SPOT_OFFSET = 70
+# Espaçamento (px base) entre pontos candidatos ao longo do caminho
+SPOT_SPACING = 80
+
+
+# ===============================
+# PONTOS CANDIDATOS E ESTRATÉGIAS
+# ===============================
+def candidate_spots(level_index):
+    """
+    Pontos (x, y) base dos dois lados do caminho, a SPOT_OFFSET px do eixo,
+    onde cabe uma torre (grade de ocupação) e sem cair perto de outro trecho
+    do caminho.
+    """
+    table = paths.get_path_table(level_index)
+    grid = OccupancyGrid(level_index)
+    spots = []
+    d = SPOT_SPACING / 2
+    while d < table.length:
+        seg = table.segment_at(d)
+        x, y = table.position(d, seg)
+        dx, dy = table.dirs[seg]
+        for side in (1, -1):
+            sx = x - dy * SPOT_OFFSET * side
+            sy = y + dx * SPOT_OFFSET * side
+            if grid.can_place(sx, sy) and _path_clearance(table, sx, sy) >= SPOT_OFFSET - 1:
+                spots.append((int(sx), int(sy)))
+        d += SPOT_SPACING
+    return spots
+
+
+def _path_clearance(table, x, y):
+    """Menor distância de (x, y) a qualquer segmento do caminho."""
+    best = float("inf")
+    for (ax, ay), (bx, by) in zip(table.points, table.points[1:]):
+        vx, vy = bx - ax, by - ay
+        length2 = vx * vx + vy * vy
+        t = 0.0 if length2 == 0 else max(0.0, min(1.0, ((x - ax) * vx + (y - ay) * vy) / length2))
+        px, py = ax + vx * t - x, ay + vy * t - y
+        best = min(best, (px * px + py * py) ** 0.5)
+    return best
+
+
+def strategy_idle(sim, spots, memory):
+    """Não constrói nada (referência: quanto o nível vaza sozinho)."""
+
+
+def build(sim, tower_class, spots):
+    """
+    Compra `tower_class` no próximo ponto livre de `spots` (consumindo os
+    que outras torres já ocuparam). Retorna a torre, ou None se acabaram os
+    pontos ou o dinheiro.
+    """
+    while spots and not sim.occupancy.can_place(*spots[-1]):
+        spots.pop()
+    if not spots:
+        return None
+    tower = sim.place_tower(tower_class, spots[-1])
+    if tower is not None:
+        spots.pop()
+    return tower
+
+
+def strategy_basic(sim, spots, memory):
+    """Compra BasicTower sempre que houver dinheiro."""
+    while build(sim, BasicTower, spots):
+        pass
+
+
+def strategy_sniper(sim, spots, memory):
+    """Compra SniperTower sempre que houver dinheiro."""
+    while build(sim, SniperTower, spots):
+        pass
+
+
+def strategy_mixed(sim, spots, memory):
+    """Alterna BasicTower e SniperTower; espera juntar dinheiro para a próxima da vez."""
+    order = (BasicTower, SniperTower)
+    while build(sim, order[memory.get("built", 0) % 2], spots):
+        memory["built"] = memory.get("built", 0) + 1
+
+
+def strategy_upgrade(sim, spots, memory):
+    """Até 3 BasicTowers; depois gasta tudo em upgrades da torre de menor nível."""
+    if len(sim.towers) < 3:
+        build(sim, BasicTower, spots)
+        return
+    for tower in sorted(sim.towers, key=lambda t: t.level):
+        level = tower.level
+        sim.upgrade_tower(tower)
+        if tower.level == level:
+            break
+
+
+STRATEGIES = {
+    "idle":    strategy_idle,
+    "basic":   strategy_basic,
+    "sniper":  strategy_sniper,
+    "mixed":   strategy_mixed,
+    "upgrade": strategy_upgrade,
+}
+
+
+# ===============================
+# UMA PARTIDA
+# ===============================
+def play_match(level_index, strategy, seed, max_ticks):
+    """
+    Roda uma partida completa sem janela. Retorna um dicionário com o
+    resultado final, os números de cada onda e a curva de dinheiro
+    (uma amostra por segundo de simulação).
+    """
+    sim = Simulation(level_index, seed=seed)
+    waves = LEVELS[level_index]
+    sizes = [wave_size(wave) for wave in waves]
+    plan = STRATEGIES[strategy]
+    # RNG próprio da estratégia: não consome o sorteio dos inimigos
+    spots = candidate_spots(level_index)
+    random.Random(f"{seed}:{strategy}").shuffle(spots)
+    memory = {}
+
+    leaks = [0] * len(waves)
+    kills = [0] * len(waves)
+    resolved = [0] * len(waves)
+    cleared = [False] * len(waves)
+    money_start = [None] * len(waves)
+    money_curve = []
+    tracked = set()
+
+    while sim.tick < max_ticks:
+        if sim.tick % SIM_TICK_RATE == 0:
+            money_curve.append(sim.game_state.money)
+        if sim.tick % DECISION_TICKS == 0:
+            plan(sim, spots, memory)
+
+        sim.step(TICK_MS)
+
+        wave = sim.level_manager.current_wave
+        if wave < len(waves) and money_start[wave] is None:
+            money_start[wave] = sim.game_state.money
+
+        # Inimigos novos entram no conjunto; os que saíram do grupo são contabilizados
+        tracked.update(sim.enemies)
+        for enemy in [e for e in tracked if not e.alive()]:
+            tracked.discard(enemy)
+            w = enemy.wave
+            if enemy.hp > 0:
+                leaks[w] += 1
+            else:
+                kills[w] += 1
+            resolved[w] += 1
+            if resolved[w] == sizes[w]:
+                cleared[w] = sim.game_state.lives > 0
+
+        if sim.level_complete or sim.game_over:
+            break
+
+    return {
+        "seed": seed,
+        "strategy": strategy,
+        "won": sim.level_complete and not sim.game_over,
+        "ticks": sim.tick,
+        "lives": sim.game_state.lives,
+        "money": sim.game_state.money,
+        "towers": len(sim.towers),
+        "waves": [
+            {"leaks": leaks[w], "kills": kills[w], "cleared": cleared[w], "money_start": money_start[w]}
+            for w in range(len(waves))
+        ],
+        "money_curve": money_curve,
+    }
+
+
+def play_chunk(jobs):
+    """Executado em cada processo: uma lista de partidas → lista de resultados."""
+    return [play_match(*job) for job in jobs]
+
+
+# ===============================
+# AGREGAÇÃO E RELATÓRIO
+# ===============================
+def _mean(values):
+    return sum(values) / len(values) if values else 0.0
+
+
+def aggregate(results, num_waves):
+    """Resume uma lista de partidas (mesma estratégia) em números por onda."""
+    n = len(results)
+    report = {
+        "matches": n,
+        "win_rate": _mean([r["won"] for r in results]),
+        "mean_lives": _mean([r["lives"] for r in results]),
+        "mean_money": _mean([r["money"] for r in results]),
+        "mean_towers": _mean([r["towers"] for r in results]),
+        "mean_seconds": _mean([r["ticks"] for r in results]) / SIM_TICK_RATE,
+        "waves": [],
+        "money_curve": [],
+    }
+    for w in range(num_waves):
+        waves = [r["waves"][w] for r in results]
+        started = [x["money_start"] for x in waves if x["money_start"] is not None]
+        report["waves"].append({
+            "mean_leaks": _mean([x["leaks"] for x in waves]),
+            "leak_free": _mean([x["leaks"] == 0 and x["cleared"] for x in waves]),
+            "survival": _mean([x["cleared"] for x in waves]),
+            "mean_kills": _mean([x["kills"] for x in waves]),
+            "mean_money_start": _mean(started),
+        })
+
+    # Curva de dinheiro: média por segundo entre as partidas ainda em andamento
+    longest = max((len(r["money_curve"]) for r in results), default=0)
+    for t in range(longest):
+        samples = [r["money_curve"][t] for r in results if t < len(r["money_curve"])]
+        report["money_curve"].append({"t": t, "mean": _mean(samples), "matches": len(samples)})
+    return report
+
+
+def print_report(report, level_index, elapsed, total):
+    print(f"Nível {level_index + 1}: {total} partidas em {elapsed:.1f}s "
+          f"({total / elapsed:.0f} partidas/s)")
+    for strategy, rep in report.items():
+        print()
+        print(f"== {strategy} ({rep['matches']} partidas) ==")
+        print(f"vitórias {rep['win_rate']:.1%}   vidas {rep['mean_lives']:.2f}   "
+              f"dinheiro final {rep['mean_money']:.0f}   torres {rep['mean_towers']:.1f}   "
+              f"duração {rep['mean_seconds']:.0f}s")
+        print(f"{'onda':>5} {'vazam.':>7} {'sem vaz.':>9} {'sobrev.':>8} {'abates':>7} {'$ início':>9}")
+        for i, w in enumerate(rep["waves"]):
+            print(f"{i + 1:>5} {w['mean_leaks']:>7.2f} {w['leak_free']:>9.1%} {w['survival']:>8.1%} "
+                  f"{w['mean_kills']:>7.2f} {w['mean_money_start']:>9.0f}")
+        curve = rep["money_curve"][::10]
+        if curve:
+            print("dinheiro: " + "  ".join(f"{p['t']}s:{p['mean']:.0f}" for p in curve))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Balanceamento de ondas por simulação em lote.")
+    parser.add_argument("-l", "--level", type=int, default=0, help="índice do nível (0 = nível 1)")
+    parser.add_argument("-n", "--matches", type=int, default=1000, help="partidas por estratégia")
+    parser.add_argument("-s", "--strategy", nargs="+", choices=list(STRATEGIES), default=list(STRATEGIES))
+    parser.add_argument("-j", "--jobs", type=int, default=os.cpu_count() or 1, help="processos")
+    parser.add_argument("--seed", type=int, default=0, help="semente da primeira partida")
+    parser.add_argument("--max-ticks", type=int, default=SIM_TICK_RATE * 600,
+                        help="limite de ticks por partida (padrão: 10 min simulados)")
+    parser.add_argument("--json", help="grava o relatório completo neste arquivo")
+    args = parser.parse_args()
+
+    if not (0 <= args.level < min(len(LEVELS), len(paths.PATHS))):
+        parser.error(f"nível {args.level} sem ondas ou sem caminho definido")
+
+    jobs = [(args.level, strategy, args.seed + i, args.max_ticks)
+            for strategy in args.strategy for i in range(args.matches)]
+    # Lotes pequenos o bastante para equilibrar a carga, grandes o bastante
+    # para o custo de IPC ser desprezível
+    chunk = max(1, len(jobs) // (args.jobs * 8))
+    chunks = [jobs[i:i + chunk] for i in range(0, len(jobs), chunk)]
+
+    start = time.perf_counter()
+    results = {strategy: [] for strategy in args.strategy}
+    if args.jobs > 1:
+        with Pool(args.jobs) as pool:
+            for batch in pool.imap_unordered(play_chunk, chunks):
+                for r in batch:
+                    results[r["strategy"]].append(r)
+    else:
+        for c in chunks:
+            for r in play_chunk(c):
+                results[r["strategy"]].append(r)
+    elapsed = time.perf_counter() - start
+
+    num_waves = len(LEVELS[args.level])
+    report = {strategy: aggregate(rs, num_waves) for strategy, rs in results.items()}
+    print_report(report, args.level, elapsed, len(jobs))
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"level": args.level, "jobs": args.jobs, "seconds": elapsed,
+                       "strategies": report}, f, indent=2)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,80 @@
+# benchmarks/bench_enemy_pool.py
+"""
+Custo por tick do movimento de inimigos: Enemy.update() por sprite, o
+EnemyPool vetorizado (NumPy) sozinho e o EnemyEngine (ENEMY_ENGINE = "pool"),
+que move os sprites da partida pelo pool, para várias quantidades.
+"""
+#
+# Uso (a partir da raiz do projeto):
+#     python benchmarks/bench_enemy_pool.py
+#     python benchmarks/bench_enemy_pool.py --enemies 1000 10000 50000
+
+import os
+import sys
+import time
+import random
+import argparse
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)  # os caminhos de assets são relativos à raiz
+
+import pygame
+
+from simulation import TICK_MS
+from enemies import BasicEnemy
+from enemy_pool import EnemyPool, EnemyEngine
+from context import GameContext
+from game_state import GameState
+
+
+def time_sprites(n, ticks, seed):
+    ctx = GameContext(seed)
+    group = pygame.sprite.Group(BasicEnemy(ctx) for _ in range(n))
+    start = time.perf_counter()
+    for _ in range(ticks):
+        group.update(TICK_MS / 1000)
+    return (time.perf_counter() - start) / ticks
+
+
+def time_engine(n, ticks, seed):
+    ctx = GameContext(seed)
+    engine = EnemyEngine(ctx)
+    engine.group.add(BasicEnemy(ctx) for _ in range(n))
+    engine.step(0.0)  # carga inicial do pool fora da medição
+    start = time.perf_counter()
+    for _ in range(ticks):
+        engine.step(TICK_MS / 1000)
+    return (time.perf_counter() - start) / ticks
+
+
+def time_pool(n, ticks, seed):
+    rng = random.Random(seed)
+    pool = EnemyPool(0, capacity=n, state=GameState())
+    for _ in range(n):
+        pool.spawn(60.0 + rng.uniform(0, 18.0), 5, 10)
+    start = time.perf_counter()
+    for _ in range(ticks):
+        pool.step(TICK_MS / 1000)
+    return (time.perf_counter() - start) / ticks
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--enemies", type=int, nargs="+", default=[100, 1000, 10000])
+    parser.add_argument("--ticks", type=int, default=60)
+    parser.add_argument("--seed", type=int, default=1234)
+    args = parser.parse_args()
+
+    print(f"{'inimigos':>9} {'sprites (ms)':>13} {'pool (ms)':>10} {'ganho':>7} "
+          f"{'engine (ms)':>12} {'ganho':>7}")
+    for n in args.enemies:
+        sprites = time_sprites(n, args.ticks, args.seed)
+        pool = time_pool(n, args.ticks, args.seed)
+        engine = time_engine(n, args.ticks, args.seed)
+        print(f"{n:>9} {sprites * 1000:>13.3f} {pool * 1000:>10.3f} {sprites / pool:>6.1f}x "
+              f"{engine * 1000:>12.3f} {sprites / engine:>6.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+# benchmarks/bench_spatial.py
+"""
+Compara a mira "closest" por força bruta (Tower.find_target sem índice,
+que varre o grupo inteiro) com uma busca pela grade do SpatialHash, para
+vários tamanhos de cenário. A mira do jogo não usa a grade (vai pelo
+ProgressIndex e pela cobertura); ela fica aqui como referência.
+"""
+#
+# Uso (a partir da raiz do projeto):
+#     python benchmarks/bench_spatial.py
+#     python benchmarks/bench_spatial.py --towers 200 --enemies 50 100 500 1000
+
+import os
+import sys
+import time
+import random
+import argparse
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)  # os caminhos de assets são relativos à raiz
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+
+from config import BASE_WIDTH, BASE_HEIGHT
+from context import GameContext
+from enemies import BasicEnemy
+from towers import BasicTower, SniperTower
+from spatial import SpatialHash
+
+
+def build_scenario(n_towers, n_enemies, rng):
+    ctx = GameContext(seed=rng.random())
+    enemies = pygame.sprite.Group()
+    for _ in range(n_enemies):
+        enemy = BasicEnemy(ctx)
+        enemy.pos_base = [rng.randrange(BASE_WIDTH), rng.randrange(BASE_HEIGHT)]
+        enemies.add(enemy)
+
+    towers = []
+    for i in range(n_towers):
+        pos = (rng.randrange(BASE_WIDTH), rng.randrange(BASE_HEIGHT))
+        tower = SniperTower(ctx, pos) if i % 4 == 0 else BasicTower(ctx, pos)
+        # A força bruta de referência é a política "closest" (independe do config)
+        tower.policy = "closest"
+        towers.append(tower)
+    return towers, enemies
+
+
+def distance2(tower, enemy):
+    dx = enemy.pos_base[0] - tower.pos_base[0]
+    dy = enemy.pos_base[1] - tower.pos_base[1]
+    return dx * dx + dy * dy
+
+
+def grid_closest(tower, index):
+    """
+    "closest" pela grade: só os inimigos das células que cruzam o range, com
+    o mesmo critério e os mesmos empates de Tower._find_closest.
+    """
+    cx, cy = tower.pos_base
+    target = None
+    min_d2 = tower.range * tower.range
+    for enemy, d2 in index.query(cx, cy, tower.range):
+        if enemy.hp <= enemy.pending_damage:
+            continue
+        if target is None or d2 < min_d2:
+            min_d2 = d2
+            target = enemy
+    return target
+
+
+def check_same_targets(towers, enemies):
+    """
+    Sanidade: força bruta e grade escolhem o mesmo alvo — ou, num empate de
+    distância (posições inteiras), alvos à mesma distância da torre.
+    Retorna quantas torres tinham alvo.
+    """
+    index = SpatialHash()
+    index.update(enemies)
+    found = 0
+    for tower in towers:
+        a = tower.find_target(enemies)
+        b = grid_closest(tower, index)
+        if a is None or b is None:
+            assert a is b, (tower.pos_base, a, b)
+            continue
+        assert a is b or distance2(tower, a) == distance2(tower, b), (tower.pos_base, a, b)
+        assert distance2(tower, a) <= tower.range * tower.range
+        found += 1
+    return found
+
+
+def time_brute(towers, enemies, ticks):
+    start = time.perf_counter()
+    for _ in range(ticks):
+        for tower in towers:
+            tower.find_target(enemies)
+    return (time.perf_counter() - start) / ticks
+
+
+def time_grid(towers, enemies, ticks):
+    index = SpatialHash()
+    start = time.perf_counter()
+    for _ in range(ticks):
+        index.update(enemies)
+        for tower in towers:
+            grid_closest(tower, index)
+    return (time.perf_counter() - start) / ticks
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--towers", type=int, nargs="+", default=[10, 50, 100, 200])
+    parser.add_argument("--enemies", type=int, nargs="+", default=[50, 200, 500, 1000])
+    parser.add_argument("--ticks", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=1234)
+    args = parser.parse_args()
+
+    pygame.init()
+    pygame.display.set_mode((BASE_WIDTH, BASE_HEIGHT))
+
+    print(f"{'torres':>7} {'inimigos':>9} {'c/ alvo':>8} {'bruta (ms)':>11} {'grade (ms)':>11} {'ganho':>7}")
+    for n_towers in args.towers:
+        for n_enemies in args.enemies:
+            rng = random.Random(args.seed)
+            towers, enemies = build_scenario(n_towers, n_enemies, rng)
+
+            found = check_same_targets(towers, enemies)
+
+            brute = time_brute(towers, enemies, args.ticks)
+            grid = time_grid(towers, enemies, args.ticks)
+            print(f"{n_towers:>7} {n_enemies:>9} {found:>8} {brute * 1000:>11.3f} {grid * 1000:>11.3f} "
+                  f"{brute / grid if grid else float('inf'):>6.1f}x")
+
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+# benchmarks/bench_targeting.py
+"""
+Confere e mede a mira por cobertura do caminho: para cada política, o alvo
+escolhido via ProgressIndex + Tower.coverage precisa ser o mesmo de uma
+varredura por força bruta (todos os inimigos vivos dentro da cobertura),
+em cada disparo de uma partida real do nível 1 — ou seja, dentro de
+Simulation.step(), com o índice ainda por reordenar naquele tick.
+"""
+#
+# Uso (a partir da raiz do projeto):
+#     python benchmarks/bench_targeting.py
+#     python benchmarks/bench_targeting.py --matches 20 --towers 3 --seed 7
+#
+# Poucas torres por partida de propósito: a primeira torre a mirar em cada
+# tick é a que encontra o índice desatualizado (ProgressIndex.window()
+# reordena e troca a lista), então é ela que precisa ser conferida.
+
+import os
+import sys
+import time
+import random
+import argparse
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)  # os caminhos de assets são relativos à raiz
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+from simulation import Simulation
+from towers import BasicTower, SniperTower, TARGET_POLICIES
+
+
+def reference_key(tower):
+    """Critério de cada política como valor a maximizar (força bruta)."""
+    cx, cy = tower.pos_base
+    return {
+        "first":     lambda e: e.distance,
+        "last":      lambda e: -e.distance,
+        "strongest": lambda e: e.hp,
+        "weakest":   lambda e: -e.hp,
+        "closest":   lambda e: -((e.pos_base[0] - cx) ** 2 + (e.pos_base[1] - cy) ** 2),
+    }[tower.policy]
+
+
+def reference_target(tower, enemies):
+    """Melhor inimigo vivo (hp > pending_damage) dentro da cobertura, e o valor do critério."""
+    key = reference_key(tower)
+    alive = [e for e in enemies if tower.covers(e.distance) and e.hp > e.pending_damage]
+    if not alive:
+        return None, None
+    best = max(alive, key=key)
+    return best, key(best)
+
+
+def build_match(n_towers, seed):
+    sim = Simulation(0, seed=seed)
+    sim.game_state.money = 10 ** 9
+    rng = random.Random(seed)
+    spots = sim.occupancy.legal_spots(4)
+    rng.shuffle(spots)
+    for i, spot in enumerate(spots):
+        if len(sim.towers) == n_towers:
+            break
+        tower = sim.place_tower(SniperTower if i % 3 == 0 else BasicTower, spot)
+        if tower is not None:
+            sim.set_target_policy(tower, TARGET_POLICIES[(seed + len(sim.towers)) % len(TARGET_POLICIES)])
+    return sim
+
+
+def instrument(tower, checks, indexed, brute):
+    """
+    Troca find_target da torre por uma versão que confere cada escolha com
+    reference_target() e soma os tempos das duas buscas.
+    """
+    find_target = tower.find_target
+
+    def checked(enemies_group, progress_index=None):
+        policy = tower.policy
+        start = time.perf_counter()
+        got = find_target(enemies_group, progress_index)
+        mid = time.perf_counter()
+        want, want_key = reference_target(tower, enemies_group)
+        end = time.perf_counter()
+        indexed[policy] += mid - start
+        brute[policy] += end - mid
+
+        # Empates no critério valem qualquer um dos empatados
+        if want is None:
+            assert got is None, (policy, got)
+        else:
+            assert got is not None, (policy, want)
+            assert tower.covers(got.distance) and got.hp > got.pending_damage, policy
+            assert reference_key(tower)(got) == want_key, (policy, got, want)
+        checks[policy] += 1
+        return got
+
+    tower.find_target = checked
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--matches", type=int, default=12)
+    parser.add_argument("--towers", type=int, default=4)
+    parser.add_argument("--ticks", type=int, default=3000)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    checks = {policy: 0 for policy in TARGET_POLICIES}
+    indexed = {policy: 0.0 for policy in TARGET_POLICIES}
+    brute = {policy: 0.0 for policy in TARGET_POLICIES}
+    for seed in range(args.seed, args.seed + args.matches):
+        sim = build_match(args.towers, seed)
+        for tower in sim.towers:
+            instrument(tower, checks, indexed, brute)
+        for _ in range(args.ticks):
+            sim.step()
+
+    print(f"{'política':>10} {'buscas':>8} {'índice (µs)':>12} {'bruta (µs)':>11}")
+    for policy in TARGET_POLICIES:
+        n = max(checks[policy], 1)
+        print(f"{policy:>10} {checks[policy]:>8} {indexed[policy] / n * 1e6:>12.2f} "
+              f"{brute[policy] / n * 1e6:>11.2f}")
+    print("ok: alvos iguais aos da força bruta")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,361 @@
+# benchmarks/run_benchmarks.py
+#
+# Suíte de benchmarks por cenário do loop do jogo.
+# Monta cenários com as classes reais (Tower, Enemy, Bullet, LEVELS) sobre a
+# Simulation, roda com o driver de vídeo “dummy” do SDL e mede cada fase do
+# tick: inimigos, projéteis, mira das torres e desenho (além de resize).
+#
+# Uso (a partir da raiz do projeto):
+#     python benchmarks/run_benchmarks.py                        # todos, JSON no stdout
+#     python benchmarks/run_benchmarks.py -s bullet_storm -o out.json
+#     python benchmarks/run_benchmarks.py --save-baseline benchmarks/baseline.json
+#     python benchmarks/run_benchmarks.py --baseline benchmarks/baseline.json --threshold 0.25
+#     python benchmarks/run_benchmarks.py --replay replays/sessao-*.json   # partidas reais
+#
+# Com --baseline, sai com código 1 se alguma fase ficar mais de `threshold`
+# (fração) acima da média registrada no baseline.
+
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import platform
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)  # os caminhos de assets são relativos à raiz
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame
+
+import config
+import paths
+import sprite_cache
+from config import BASE_WIDTH, BASE_HEIGHT, BACKGROUND_FILES
+from enemies import BasicEnemy, FastEnemy
+from towers import BasicTower, SniperTower
+from simulation import Simulation, TICK_MS
+from renderer import Renderer
+from profiler import PhaseTimer
+from replay import ReplayLog, ReplayPlayer
+
+
+# ===============================
+# MONTAGEM DOS CENÁRIOS
+# ===============================
+def spread_enemies(sim, count, rng):
+    """Coloca `count` inimigos reais espalhados ao longo do caminho do nível."""
+    table = paths.get_path_table(sim.level_index)
+    for i in range(count):
+        cls = FastEnemy if i % 3 == 0 else BasicEnemy
+        enemy = cls(sim.ctx)
+        enemy.hp = 10 ** 6  # não morrem: a carga fica constante durante a medição
+        enemy.distance = rng.uniform(0, table.length * 0.9)
+        enemy.segment = table.segment_at(enemy.distance)
+        enemy.pos_base[:] = table.position(enemy.distance, enemy.segment)
+        enemy.prev_pos_base = tuple(enemy.pos_base)
+        sim.enemies.add(enemy)
+
+
+def place_towers(sim, tower_class, count, rng):
+    """
+    Posiciona `count` torres a até 150 px base do caminho. Carga sintética:
+    as torres podem se sobrepor (não passam pela grade de ocupação).
+    """
+    table = paths.get_path_table(sim.level_index)
+    towers = []
+    for _ in range(count):
+        x, y = table.position(rng.uniform(0, table.length))
+        pos = (int(x + rng.uniform(-150, 150)), int(y + rng.uniform(-150, 150)))
+        tower = tower_class(sim.ctx, pos, sim.time_ms)
+        sim.towers.add(tower)
+        towers.append(tower)
+    return towers
+
+
+def scenario_towers_vs_enemies(rng):
+    """50 torres (básicas e sniper) contra 1.000 inimigos no caminho."""
+    sim = Simulation(0, seed=rng.random())
+    place_towers(sim, BasicTower, 35, rng)
+    place_towers(sim, SniperTower, 15, rng)
+    spread_enemies(sim, 1000, rng)
+    return sim
+
+
+def scenario_towers_first_policy(rng):
+    """Igual a towers_vs_enemies, com as torres mirando no inimigo mais adiantado ("first")."""
+    sim = scenario_towers_vs_enemies(rng)
+    for tower in sim.towers:
+        sim.set_target_policy(tower, "first")
+    return sim
+
+
+def scenario_bullet_storm(rng):
+    """200 SniperTowers disparando 10×/s sobre 300 inimigos: muitos projéteis em voo."""
+    sim = Simulation(0, seed=rng.random())
+    for tower in place_towers(sim, SniperTower, 200, rng):
+        tower.fire_rate = 10.0
+    spread_enemies(sim, 300, rng)
+    return sim
+
+
+def scenario_bullet_storm_intercept(rng):
+    """Mesma chuva de projéteis, no modo "intercept" (impacto agendado no disparo)."""
+    sim = Simulation(0, seed=rng.random(), bullet_mode="intercept")
+    for tower in place_towers(sim, SniperTower, 200, rng):
+        tower.fire_rate = 10.0
+    spread_enemies(sim, 300, rng)
+    return sim
+
+
+def scenario_level_playthrough(rng):
+    """Nível 1 real (LEVELS[0]) com algumas torres, do início ao fim das ondas."""
+    sim = Simulation(0, seed=rng.random())
+    place_towers(sim, BasicTower, 6, rng)
+    place_towers(sim, SniperTower, 4, rng)
+    return sim
+
+
+SCENARIOS = {
+    "towers_vs_enemies": (scenario_towers_vs_enemies, 300),
+    "towers_first_policy": (scenario_towers_first_policy, 300),
+    "bullet_storm":      (scenario_bullet_storm, 300),
+    "bullet_storm_intercept": (scenario_bullet_storm_intercept, 300),
+    "level_playthrough": (scenario_level_playthrough, 3600),
+}
+
+
+def replay_scenario(path):
+    """Cenário a partir de uma partida gravada (replay.py): mesmas ações nos mesmos ticks."""
+    log = ReplayLog.load(path)
+
+    def build(rng):
+        return ReplayPlayer(log)
+
+    return build, log.end_tick
+
+
+# ===============================
+# EXECUÇÃO E ESTATÍSTICAS
+# ===============================
+def summarize(samples):
+    """Estatísticas (ms) de uma lista de amostras em segundos."""
+    if not samples:
+        return {"mean_ms": 0.0, "p50_ms": 0.0, "p95_ms": 0.0, "max_ms": 0.0, "total_ms": 0.0}
+    ordered = sorted(samples)
+    n = len(ordered)
+    return {
+        "mean_ms": sum(ordered) / n * 1000,
+        "p50_ms": ordered[n // 2] * 1000,
+        "p95_ms": ordered[min(n - 1, int(n * 0.95))] * 1000,
+        "max_ms": ordered[-1] * 1000,
+        "total_ms": sum(ordered) * 1000,
+    }
+
+
+def load_background(level_index, size):
+    bg = pygame.image.load(BACKGROUND_FILES[level_index]).convert()
+    return pygame.transform.scale(bg, size)
+
+
+def run_sim_scenario(name, build, ticks, seed, warmup):
+    rng = random.Random(seed)
+    # build devolve uma Simulation ou um replay.ReplayPlayer; ambos têm
+    # step(dt) — o player aplica as ações gravadas antes de cada tick
+    runner = build(rng)
+    sim = getattr(runner, "sim", runner)
+    screen = pygame.display.get_surface()
+    renderer = Renderer()
+    renderer.rebuild_static(screen, load_background(sim.level_index, screen.get_size()), sim.level_index)
+    groups = (sim.enemies, sim.towers, sim.bullets)
+
+    timer = PhaseTimer()
+    sim.phase_timer = timer
+    phases = {}
+    peak = {"enemies": 0, "towers": 0, "bullets": 0}
+
+    for i in range(warmup + ticks):
+        runner.step(TICK_MS)
+        timer.start()
+        sim.interpolate(1.0)
+        renderer.begin(screen, groups)
+        renderer.draw_sprites(screen, groups)
+        renderer.present()
+        timer.lap("draw")
+
+        sample = timer.take()
+        if i < warmup:
+            continue
+        for phase, seconds in sample.items():
+            phases.setdefault(phase, []).append(seconds)
+        peak["enemies"] = max(peak["enemies"], len(sim.enemies))
+        peak["towers"] = max(peak["towers"], len(sim.towers))
+        peak["bullets"] = max(peak["bullets"], len(sim.bullets))
+
+    return {
+        "ticks": ticks,
+        "phases": {phase: summarize(samples) for phase, samples in phases.items()},
+        "peak_entities": peak,
+        "bullet_pool": sim.ctx.bullet_pool.stats(),
+    }
+
+
+def run_resize_scenario(ticks, seed, warmup, canvas=False):
+    """
+    Rajada de VIDEORESIZE: recalcula escala, cache de sprites e camada estática.
+    canvas=True mede o modo RENDER_MODE = "canvas": a simulação e a camada
+    estática ficam na base e o resize só troca a janela (present() escala).
+    """
+    rng = random.Random(seed)
+    sim = scenario_towers_vs_enemies(rng)
+    groups = (sim.enemies, sim.towers, sim.bullets)
+    bg_src = pygame.image.load(BACKGROUND_FILES[0]).convert()
+    timer = PhaseTimer()
+    if canvas:
+        sim.ctx.set_scale(1.0, 1.0)
+        renderer = Renderer(canvas_size=(BASE_WIDTH, BASE_HEIGHT))
+        renderer.rebuild_static(pygame.display.get_surface(), bg_src, 0)
+    else:
+        renderer = Renderer()
+    phases = {}
+
+    for i in range(warmup + ticks):
+        w = rng.randrange(640, BASE_WIDTH + 1)
+        h = rng.randrange(480, BASE_HEIGHT + 1)
+        timer.start()
+        if canvas:
+            screen = pygame.display.set_mode((w, h), pygame.RESIZABLE)
+            renderer.invalidate()
+        else:
+            config.update_screen_size(w, h)
+            sprite_cache.evict_stale()
+            sim.ctx.set_scale(config.SCALE_X, config.SCALE_Y)
+            screen = pygame.display.set_mode((w, h), pygame.RESIZABLE)
+            renderer.rebuild_static(screen, pygame.transform.scale(bg_src, (w, h)), 0)
+        timer.lap("resize")
+
+        sim.interpolate(1.0)
+        renderer.begin(screen, groups)
+        renderer.draw_sprites(screen, groups)
+        renderer.present()
+        timer.lap("draw")
+
+        sample = timer.take()
+        if i >= warmup:
+            for phase, seconds in sample.items():
+                phases.setdefault(phase, []).append(seconds)
+
+    config.update_screen_size(BASE_WIDTH, BASE_HEIGHT)
+    sprite_cache.evict_stale()
+    pygame.display.set_mode((BASE_WIDTH, BASE_HEIGHT))
+    return {
+        "ticks": ticks,
+        "phases": {phase: summarize(samples) for phase, samples in phases.items()},
+        "peak_entities": {"enemies": len(sim.enemies), "towers": len(sim.towers), "bullets": 0},
+    }
+
+
+def compare(results, baseline, threshold):
+    """Lista de regressões: fases cuja média passou de baseline × (1 + threshold)."""
+    regressions = []
+    for name, result in results["scenarios"].items():
+        base = baseline.get("scenarios", {}).get(name)
+        if base is None:
+            continue
+        for phase, stats in result["phases"].items():
+            base_stats = base["phases"].get(phase)
+            if base_stats is None or base_stats["mean_ms"] <= 0:
+                continue
+            ratio = stats["mean_ms"] / base_stats["mean_ms"]
+            if ratio > 1.0 + threshold:
+                regressions.append({
+                    "scenario": name,
+                    "phase": phase,
+                    "baseline_ms": base_stats["mean_ms"],
+                    "current_ms": stats["mean_ms"],
+                    "ratio": ratio,
+                })
+    return regressions
+
+
+def main():
+    all_names = list(SCENARIOS) + ["resize_storm", "resize_storm_canvas"]
+    parser = argparse.ArgumentParser(description="Benchmarks por cenário do loop do jogo.")
+    parser.add_argument("-s", "--scenario", nargs="+", choices=all_names, default=all_names)
+    parser.add_argument("--ticks", type=int, default=None, help="sobrescreve os ticks de cada cenário")
+    parser.add_argument("--warmup", type=int, default=30)
+    parser.add_argument("--seed", type=int, default=1234)
+    parser.add_argument("-o", "--output", help="grava o JSON neste arquivo (padrão: stdout)")
+    parser.add_argument("--save-baseline", help="grava o resultado também como baseline")
+    parser.add_argument("--baseline", help="compara com este baseline e falha se regredir")
+    parser.add_argument("--threshold", type=float, default=0.20,
+                        help="regressão tolerada por fase, em fração (0.20 = +20%%)")
+    parser.add_argument("--replay", nargs="+", default=[],
+                        help="partidas gravadas (replay.py) a medir como cenários extras")
+    args = parser.parse_args()
+
+    pygame.init()
+    pygame.display.set_mode((BASE_WIDTH, BASE_HEIGHT))
+
+    results = {
+        "meta": {
+            "python": platform.python_version(),
+            "pygame": pygame.version.ver,
+            "platform": platform.platform(),
+            "seed": args.seed,
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "scenarios": {},
+    }
+
+    for name in args.scenario:
+        if name in ("resize_storm", "resize_storm_canvas"):
+            ticks = args.ticks or 40
+            result = run_resize_scenario(ticks, args.seed, min(args.warmup, 5),
+                                         canvas=name == "resize_storm_canvas")
+        else:
+            build, default_ticks = SCENARIOS[name]
+            result = run_sim_scenario(name, build, args.ticks or default_ticks, args.seed, args.warmup)
+        results["scenarios"][name] = result
+        print(f"{name}: " + ", ".join(f"{p}={s['mean_ms']:.3f}ms" for p, s in result["phases"].items()),
+              file=sys.stderr)
+
+    for path in args.replay:
+        # O replay inteiro é medido (sem aquecimento): ticks = duração gravada
+        name = "replay:" + os.path.splitext(os.path.basename(path))[0]
+        build, end_tick = replay_scenario(path)
+        result = run_sim_scenario(name, build, end_tick, args.seed, 0)
+        results["scenarios"][name] = result
+        print(f"{name}: " + ", ".join(f"{p}={s['mean_ms']:.3f}ms" for p, s in result["phases"].items()),
+              file=sys.stderr)
+
+    status = 0
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.threshold)
+        results["regressions"] = regressions
+        for r in regressions:
+            print(f"REGRESSÃO {r['scenario']}/{r['phase']}: {r['baseline_ms']:.3f}ms → "
+                  f"{r['current_ms']:.3f}ms ({r['ratio']:.2f}×)", file=sys.stderr)
+        status = 1 if regressions else 0
+
+    text = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+    if args.save_baseline:
+        with open(args.save_baseline, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+
+    pygame.quit()
+    sys.exit(status)
+
+
+if __name__ == "__main__":
+    main()
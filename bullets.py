@@ -2,71 +2,221 @@
 
 import pygame
 import math
-from game_state import game_state
-from config import SCALE, BULLET_BASE_SIZE
+from config import BULLET_BASE_SIZE, BULLET_POOL_SIZE
 
 class Bullet(pygame.sprite.Sprite):
-    def __init__(self, pos_screen, target, damage=1, speed=5, image_path=None):
+    # Valores de cada tipo de projétil (as subclasses sobrescrevem)
+    DAMAGE = 1
+    SPEED = 5
+    IMAGE = None
+
+    def __init__(self, ctx, pos_base, target, damage=None, speed=None, image_path=None):
         """
-        pos_screen: (x, y) em coordenadas de tela (já escaladas) onde a torre disparou.
-        target: instância de Enemy (com .rect.center em coordenadas de tela).
+        ctx: GameContext da partida (escala de tela).
+        pos_base: (x, y) em coordenadas base (1536×1024) onde a torre disparou.
+        target: instância de Enemy (persegue target.pos_base, também em base).
+        damage / speed / image_path: None usa DAMAGE / SPEED / IMAGE da classe.
+        speed: px base por segundo de simulação.
         """
         super().__init__()
-        self.pos = list(pos_screen)
+        self.ctx = ctx
+        self.image_path = image_path if image_path is not None else self.IMAGE
+        self._image_scale = None
+        self.pos_base = [0.0, 0.0]
+        # True enquanto o dano deste projétil conta em target.pending_damage
+        self.reserved = False
+        # True enquanto o projétil está emprestado por um BulletPool
+        self.pooled = False
+        self.reset(pos_base, target)
+        if damage is not None:
+            self.damage = damage
+        if speed is not None:
+            self.speed = speed
+
+    def reset(self, pos_base, target):
+        """
+        (Re)arma o projétil para um novo disparo de `pos_base` em `target`.
+        Chamado pelo construtor e pelo BulletPool ao reaproveitar um projétil:
+        nada é alocado além do necessário para a posição.
+        """
+        self.pos_base[0] = pos_base[0]
+        self.pos_base[1] = pos_base[1]
+        self.prev_pos_base = (pos_base[0], pos_base[1])  # posição no tick anterior (interpolação)
         self.target = target
-        self.damage = damage
-        self.speed = speed * SCALE  # velocidade proporcional ao SCALE
-
-        if image_path:
-            img = pygame.image.load(image_path).convert_alpha()
-            # Redimensiona para (BULLET_BASE_SIZE × BULLET_BASE_SIZE)
-            img = pygame.transform.scale(img, (BULLET_BASE_SIZE, BULLET_BASE_SIZE))
-            # Agora redimensiona para a tela: (BULLET_BASE_SIZE×SCALE)
-            size = max(int(BULLET_BASE_SIZE * SCALE), 1)
-            self.image = pygame.transform.scale(img, (size, size))
-        else:
-            # fallback: pequeno círculo amarelo
-            radius = max(int(5 * SCALE), 1)
-            self.image = pygame.Surface((radius*2, radius*2), pygame.SRCALPHA)
-            pygame.draw.circle(self.image, (240, 240, 80), (radius, radius), radius)
+        self.damage = self.DAMAGE
+        self.speed = self.SPEED
+        # Modo "intercept": (ox, oy, hx, hy, t_disparo, t_impacto) — origem,
+        # ponto de impacto e instantes (ms); None no modo "homing"
+        self.flight = None
+
+        if self._image_scale != self.ctx.scale:
+            # Só na criação ou depois de um resize (modo "window")
+            if self.image_path:
+                # Imagem compartilhada via cache, já em (BULLET_BASE_SIZE×SCALE)
+                self.image = self.ctx.sprite(self.image_path, BULLET_BASE_SIZE)
+            else:
+                # fallback: pequeno círculo amarelo (10 px base de diâmetro)
+                self.image = self.ctx.circle((240, 240, 80), 10)
+            self.rect = self.image.get_rect()
+            self._image_scale = self.ctx.scale
+        self._update_rect()
+
+    def _update_rect(self):
+        """Converte pos_base → posição em tela (escala do contexto)."""
+        self.rect.center = self.ctx.to_screen(self.pos_base[0], self.pos_base[1])
 
-        self.rect = self.image.get_rect(center=self.pos)
+    def reserve(self):
+        """Registra o dano deste projétil como “a caminho” do alvo (ao disparar)."""
+        if not self.reserved:
+            self.target.pending_damage += self.damage
+            self.reserved = True
+
+    def kill(self):
+        # Acertando ou não, o dano deixa de estar a caminho
+        if self.reserved:
+            self.target.pending_damage -= self.damage
+            self.reserved = False
+        super().kill()
+        if self.pooled:
+            self.ctx.bullet_pool.release(self)
+
+    def launch(self, now):
+        """
+        Modo "intercept": calcula onde e quando o projétil encontra o alvo
+        (PathTable.intercept) e agenda o impacto em ctx.events. Retorna
+        False se o alvo sai do caminho antes (nada é agendado).
+        """
+        target = self.target
+        ox, oy = self.pos_base
+        t = target.path.intercept(target.distance, target.speed, ox, oy, self.speed)
+        if t is None:
+            return False
+        hx, hy = target.path.position(target.distance + target.speed * t)
+        hit_at = now + t * 1000.0
+        self.flight = (ox, oy, hx, hy, now, hit_at)
+        self.ctx.events.schedule(hit_at, ("impact", self))
+        return True
+
+    def impact(self):
+        """Evento agendado do modo "intercept": aplica o dano (se o alvo vive) e some."""
+        if self.target.alive():
+            self.target.take_damage(self.damage)
+        self.kill()
 
-    def update(self):
+    def position_at(self, time_ms):
+        """Modo "intercept": posição (base) do projétil no instante `time_ms`."""
+        ox, oy, hx, hy, t0, t1 = self.flight
+        k = (time_ms - t0) / (t1 - t0) if t1 > t0 else 1.0
+        k = min(max(k, 0.0), 1.0)
+        return (ox + (hx - ox) * k, oy + (hy - oy) * k)
+
+    def update(self, dt):
+        """dt: duração do tick em segundos de simulação (só no modo "homing")."""
         # Se o alvo já morreu, remove a bala
         if not self.target.alive():
             self.kill()
             return
 
-        tx, ty = self.target.rect.center
-        dx = tx - self.pos[0]
-        dy = ty - self.pos[1]
+        self.prev_pos_base = (self.pos_base[0], self.pos_base[1])
+        tx, ty = self.target.pos_base
+        dx = tx - self.pos_base[0]
+        dy = ty - self.pos_base[1]
         dist = math.hypot(dx, dy)
+        step = self.speed * dt
 
-        if dist < self.speed or dist == 0:
+        if dist < step or dist == 0:
             self.target.take_damage(self.damage)
             self.kill()
         else:
-            self.pos[0] += dx / dist * self.speed
-            self.pos[1] += dy / dist * self.speed
-            self.rect.center = self.pos
+            self.pos_base[0] += dx / dist * step
+            self.pos_base[1] += dy / dist * step
 
 class BasicBullet(Bullet):
-    def __init__(self, pos_screen, target):
-        super().__init__(
-            pos_screen,
-            target,
-            damage=1,
-            speed=5,
-            image_path="assets/bullet_basic.png"
-        )
+    DAMAGE = 1
+    SPEED = 300
+    IMAGE = "assets/bullet_basic.png"
 
 class HeavyBullet(Bullet):
-    def __init__(self, pos_screen, target):
-        super().__init__(
-            pos_screen,
-            target,
-            damage=3,
-            speed=3,
-            image_path="assets/bullet_heavy.png"
-        )
+    DAMAGE = 3
+    SPEED = 180
+    IMAGE = "assets/bullet_heavy.png"
+
+
+class BulletPool:
+    """
+    Projéteis de uma partida reaproveitados em vez de recriados a cada tiro.
+
+    acquire() entrega um projétil livre do tipo pedido, já rearmado
+    (Bullet.reset), ou cria um novo; Bullet.kill() o devolve com release().
+    A imagem de cada tipo vem do sprite_cache e só é trocada quando a escala
+    muda, então um tiro não aloca Sprite, Surface nem Rect.
+
+    A capacidade é fixa: nunca existem mais de `capacity` projéteis, em voo
+    ou livres. Com todos em voo acquire() retorna None (a torre segura o
+    tiro) e conta em `refused`; `high_water` é o máximo em voo ao mesmo
+    tempo, para dimensionar BULLET_POOL_SIZE.
+    """
+
+    def __init__(self, ctx, capacity=BULLET_POOL_SIZE):
+        self.ctx = ctx
+        self.capacity = capacity
+        self._free = {}      # classe -> projéteis livres
+        self._idle = 0       # total de projéteis livres (todas as classes)
+        self.in_use = 0
+        self.high_water = 0
+        self.created = 0
+        self.reused = 0
+        self.refused = 0
+
+    def acquire(self, cls, pos_base, target):
+        """Projétil `cls` saindo de `pos_base` em direção a `target`, ou None se o pool está esgotado."""
+        if self.in_use >= self.capacity:
+            self.refused += 1
+            return None
+        free = self._free.get(cls)
+        if free:
+            bullet = free.pop()
+            self._idle -= 1
+            bullet.reset(pos_base, target)
+            self.reused += 1
+        else:
+            if self.in_use + self._idle >= self.capacity:
+                # Sem vaga: abre espaço descartando um livre de outro tipo
+                for other in self._free.values():
+                    if other:
+                        other.pop()
+                        self._idle -= 1
+                        break
+            bullet = cls(self.ctx, pos_base, target)
+            self.created += 1
+        bullet.pooled = True
+        self.in_use += 1
+        if self.in_use > self.high_water:
+            self.high_water = self.in_use
+        return bullet
+
+    def release(self, bullet):
+        """Devolve um projétil ao pool (Bullet.kill chama; repetir não tem efeito)."""
+        if not bullet.pooled:
+            return
+        bullet.pooled = False
+        bullet.target = None   # não segura o inimigo na memória
+        bullet.flight = None
+        self.in_use -= 1
+        self._idle += 1
+        self._free.setdefault(type(bullet), []).append(bullet)
+
+    def recycle(self, group):
+        """Devolve todos os projéteis de `group`, esvaziando-o (troca de nível, snapshot)."""
+        for bullet in group.sprites():
+            bullet.kill()
+
+    def stats(self):
+        return {
+            "capacity": self.capacity,
+            "in_use": self.in_use,
+            "high_water": self.high_water,
+            "created": self.created,
+            "reused": self.reused,
+            "refused": self.refused,
+        }
@@ -15,6 +15,25 @@ SCREEN_HEIGHT = 1024
 # — FPS —
 FPS = 60
 
+# —––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––—
+# PASSO FIXO DA SIMULAÇÃO
+# A lógica roda sempre a SIM_TICK_RATE ticks por segundo de tempo
+# simulado, independente do FPS de desenho. Se um frame atrasar, no
+# máximo MAX_CATCHUP_STEPS ticks são executados para alcançar o relógio
+# (o resto do atraso é descartado, evitando a “espiral da morte”).
+# —––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––—
+SIM_TICK_RATE = 60
+MAX_CATCHUP_STEPS = 5
+
+# —––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––—
+# ACELERAÇÃO (tecla F alterna entre os valores)
+# Cada frame desenhado roda “multiplicador” vezes mais ticks de simulação.
+# None = sem limite: roda ticks o mais rápido que a CPU permitir e só
+# desenha um frame a cada UNCAPPED_RENDER_INTERVAL ms reais.
+# —––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––—
+SPEED_MULTIPLIERS = [1, 2, 4, 16, None]
+UNCAPPED_RENDER_INTERVAL = 250
+
 # —––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––—
 # VARIÁVEIS DE ESCALA (RECALCULADAS NO update_screen_size)
 # —––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––—
@@ -25,12 +44,38 @@ SCALE   = min(SCALE_X, SCALE_Y)
 # — Cores de fallback para desenhar o path manualmente, se necessário —
 BG_COLOR   = (30, 30, 30)
 PATH_COLOR = (60, 60, 60)
+# Prévia de posicionamento: alcance e trechos do caminho cobertos pela torre
+COVERAGE_PREVIEW_COLOR = (90, 200, 120)
 
 # —––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––—
 # FLAG PARA DESENHAR O CAMINHO “PATH”  
 # Caso seja False, o path NÃO será desenhado em main.py  
 # —––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––—
 DRAW_PATH = True
+# Espessura do caminho desenhado, em px base (também ocupa a grade de posicionamento)
+PATH_THICKNESS = 40
+
+# —––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––—
+# DESENHO POR RETÂNGULOS SUJOS
+# True: fundo + path ficam numa camada estática e só as áreas que mudaram
+# são redesenhadas/enviadas (display.update). False: redesenha tudo e flip().
+# —––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––—
+DIRTY_RECT_RENDERING = True
+
+# —––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––—
+# MODO DE RENDERIZAÇÃO
+# "canvas": tudo (sprites, fundo, HUD, menus) é desenhado em px base num canvas
+#           fixo de BASE_WIDTH×BASE_HEIGHT, escalado para a janela uma vez por
+#           frame. Redimensionar não recria sprites, fundos, ícones nem fonte.
+# "window": desenha direto na resolução da janela; cada resize reescala
+#           fundos, ícones e fonte (modo antigo).
+# CANVAS_SMOOTH_SCALE: escala final filtrada (smoothscale) ou vizinho mais próximo.
+# RESIZE_DEBOUNCE_MS: uma rajada de VIDEORESIZE (arrastar a borda da janela)
+# só é aplicada depois desse tempo sem novos eventos, e uma vez só.
+# —––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––—
+RENDER_MODE = "canvas"
+CANVAS_SMOOTH_SCALE = True
+RESIZE_DEBOUNCE_MS = 150
 
 # —––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––—
 # DINHEIRO INICIAL E CUSTOS DE TORRES/UPGRADES
@@ -76,6 +121,15 @@ BACKGROUND_FILES = [
     "assets/L2.png",
 ]
 
+# —––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––—
+# CARREGAMENTO DOS NÍVEIS (level_assets.py)
+# Fundo e sprites de inimigos de um nível são decodificados sob demanda;
+# enquanto um nível é jogado, os LEVEL_PREFETCH seguintes são carregados
+# numa thread. Níveis fora dessa janela são descartados da memória.
+# —––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––—
+LEVEL_PREFETCH = 1
+LOADING_TEXT_COLOR = (240, 240, 240)
+
 # —––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––—
 # TAMANHOS “BASE” DOS SPRITES NA RESOLUÇÃO 1536×1024
 # Cada sprite será escalado para (BASE_SIZE × SCALE) na janela atual
@@ -89,6 +143,77 @@ BULLET_BASE_SIZE = 24    # projéteis serão 24×24 na base
 # —––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––—
 ICON_BASE_SIZE = 24     # ícones de dinheiro/vida 24×24 na base
 
+# —––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––—
+# PROFILER (tecla F3 liga/desliga o overlay)
+# PROFILER_WINDOW: quantos frames entram nos percentis p50/p95/p99
+# PROFILER_LOG_FILE: se definido, grava cada frame (JSON lines) para análise
+# —––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––—
+PROFILER_ENABLED  = False
+PROFILER_WINDOW   = 300
+PROFILER_LOG_FILE = None
+
+# STARTUP_REPORT: imprime (stderr) quanto cada etapa da abertura levou, do
+# início do main.py até o primeiro frame na tela
+STARTUP_REPORT = False
+
+# Máximo de superfícies de texto guardadas no cache LRU (text_cache.py)
+TEXT_CACHE_SIZE = 128
+
+# —––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––—
+# GRAVAÇÃO DE PARTIDAS (replay.py)
+# Com RECORD_REPLAYS = True, o main.py grava a semente e cada ação do
+# jogador (tick + ação) em REPLAY_DIR ao sair; `python replay.py arquivo`
+# reproduz a partida sem janela e confere o estado final. Desligado por
+# padrão: ligado, cada sessão deixa um arquivo em REPLAY_DIR.
+# —––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––—
+RECORD_REPLAYS = False
+REPLAY_DIR = "replays"
+
+# Jogo salvo rápido (F5 salva, F9 carrega), no formato binário do snapshot.py
+QUICKSAVE_FILE = "saves/quicksave.tdsnap"
+
+# —––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––—
+# MODO DOS PROJÉTEIS
+# "homing":    cada projétil persegue o alvo tick a tick (comportamento clássico)
+# "intercept": o instante do impacto é calculado no disparo (caminho e
+#              velocidade do alvo conhecidos); o dano é um evento agendado e
+#              o sprite só interpola a trajetória — custo O(1) por tiro.
+# —––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––—
+BULLET_MODE = "homing"
+
+# Máximo de projéteis em voo por partida (bullets.BulletPool). Os projéteis
+# são reaproveitados; com o pool cheio a torre segura o tiro até algum voltar.
+BULLET_POOL_SIZE = 1024
+
+# —––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––—
+# MOTOR DE MOVIMENTO DOS INIMIGOS
+# "sprites": cada inimigo anda no seu Enemy.update() (não exige NumPy)
+# "pool":    todos andam de uma vez nos arrays de enemy_pool.EnemyPool
+#            (NumPy) — mesmas trajetórias, vale a pena com milhares em campo
+# —––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––—
+ENEMY_ENGINE = "sprites"
+
+# —––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––—
+# ÍNDICE ESPACIAL (GRADE UNIFORME, spatial.SpatialHash)
+# Lado de cada célula, em px base (1536×1024). Valores próximos ao range das
+# torres mantêm cada consulta restrita a poucas células. Só o
+# benchmarks/bench_spatial.py usa a grade; a mira do jogo usa a cobertura.
+# —––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––—
+SPATIAL_CELL_SIZE = 128
+
+# —––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––—
+# POLÍTICA DE MIRA PADRÃO DAS TORRES (tecla T troca a da torre sob o mouse)
+# "first" (mais adiantada no caminho), "last" (mais atrasada),
+# "strongest" (mais HP), "weakest" (menos HP), "closest" (mais próxima)
+# —––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––—
+DEFAULT_TARGET_POLICY = "closest"
+
+# —––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––—
+# GRADE DE OCUPAÇÃO (occupancy.py): valida onde torres podem ser construídas
+# e acha a torre sob o mouse. Lado de cada célula, em px base.
+# —––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––—
+OCCUPANCY_CELL_SIZE = 8
+
 # —––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––—
 # Função para atualizar resolução e recalcular SCALE_X, SCALE_Y, SCALE
 # —––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––—
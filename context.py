@@ -0,0 +1,69 @@
+# context.py
+
+import random
+import pygame
+
+import config
+import sprite_cache
+from bullets import BulletPool
+from config import BULLET_MODE
+from game_state import GameState
+from scheduler import Scheduler
+
+
+class GameContext:
+    """
+    Tudo o que é “de uma partida”: GameState, RNG, nível atual, escala de
+    tela e os grupos de sprites. Cada inimigo/torre/projétil recebe o
+    contexto no construtor e só mexe nele — não há estado global de jogo,
+    então um mesmo processo pode rodar centenas de partidas lado a lado.
+
+    O que é compartilhado entre contextos é só o que é imutável: as imagens
+    decodificadas do sprite_cache e as tabelas de caminho (paths).
+    """
+
+    def __init__(self, seed=None, level_index=0, scale=None, bullet_mode=BULLET_MODE):
+        """
+        seed: semente do RNG da partida (None = aleatória).
+        scale: (scale_x, scale_y) da tela; None usa os valores atuais do config.
+        bullet_mode: "homing" ou "intercept" (ver BULLET_MODE em config.py).
+        """
+        self.rng = random.Random(seed)
+        self.state = GameState()
+        self.level_index = level_index
+        self.bullet_mode = bullet_mode
+        # Eventos em tempo de simulação da partida (ex.: ("impact", projétil))
+        self.events = Scheduler()
+
+        # RenderUpdates: grupos comuns que também informam as áreas desenhadas
+        # (usadas pelo renderizador de retângulos sujos; sem custo headless)
+        self.enemies = pygame.sprite.RenderUpdates()
+        self.towers  = pygame.sprite.RenderUpdates()
+        self.bullets = pygame.sprite.RenderUpdates()
+        # Projéteis reaproveitados entre tiros (ver bullets.BulletPool)
+        self.bullet_pool = BulletPool(self)
+
+        if scale is None:
+            scale = (config.SCALE_X, config.SCALE_Y)
+        self.set_scale(*scale)
+
+    # ===============================
+    # ESCALA DE TELA
+    # ===============================
+    def set_scale(self, scale_x, scale_y):
+        """Define a escala base → tela deste contexto (ex.: após VIDEORESIZE)."""
+        self.scale_x = scale_x
+        self.scale_y = scale_y
+        self.scale = min(scale_x, scale_y)
+
+    def to_screen(self, x, y):
+        """Converte (x, y) base (1536×1024) para px de tela."""
+        return (int(x * self.scale_x), int(y * self.scale_y))
+
+    def sprite(self, path, base_size):
+        """Sprite `path` do cache compartilhado, no tamanho (base_size × scale)."""
+        return sprite_cache.get_sprite(path, base_size, self.scale)
+
+    def circle(self, color, base_size):
+        """Círculo placeholder de diâmetro (base_size × scale)."""
+        return sprite_cache.get_circle(color, sprite_cache.screen_size(base_size, self.scale))
@@ -1,86 +1,104 @@
 # enemies.py
 
 import pygame
-import math
-import random
 import paths
-from config import ENEMY_REWARD, SCALE, ENEMY_BASE_SIZE
-from game_state import game_state
+from config import ENEMY_REWARD, ENEMY_BASE_SIZE
 
 class Enemy(pygame.sprite.Sprite):
-    def __init__(self, level_index=0):
+    def __init__(self, ctx):
+        """
+        ctx: GameContext da partida (nível, RNG, GameState que recebe
+        vidas/dinheiro e escala de tela).
+        """
         super().__init__()
-        # Pega a lista de waypoints (em base 1536×1024) do level correspondente
-        self.base_path = paths.PATHS[level_index]
-        self.waypoint = 0
+        self.ctx = ctx
+        # Caminho compilado (em base 1536×1024) do level correspondente.
+        # O estado de movimento é só a distância percorrida ao longo dele.
+        self.path = paths.get_path_table(ctx.level_index)
+        self.distance = 0.0
+        self.segment = 0
         # Posição base: inicia no primeiro ponto
-        self.pos_base = [self.base_path[0][0], self.base_path[0][1]]
+        self.pos_base = list(self.path.points[0])
+        self.prev_pos_base = tuple(self.pos_base)  # posição no tick anterior (interpolação)
         self.hp = 3
-        self.speed = 1.0
+        self.speed = 60.0   # px base por segundo de simulação
         self.reward = 5
+        self.wave = 0       # índice da onda que o gerou (preenchido pelo LevelManager)
+        # Dano dos projéteis já em voo contra este inimigo (Bullet.reserve/kill)
+        self.pending_damage = 0
 
         # Placeholder circular (será sobrescrito pelas classes filhas)
-        size = max(int(ENEMY_BASE_SIZE * SCALE), 1)
-        img = pygame.Surface((size, size), pygame.SRCALPHA)
-        pygame.draw.circle(img, (200, 50, 50), (size // 2, size // 2), size // 2)
-        self.image = img
+        self.image = ctx.circle((200, 50, 50), ENEMY_BASE_SIZE)
         self.rect = self.image.get_rect()
 
-    def update(self):
-        # Se já chegou ao último waypoint, reduz vida e mata o sprite
-        if self.waypoint + 1 >= len(self.base_path):
-            game_state.lose_life()
-            self.kill()
-            return
+    @classmethod
+    def blank(cls, ctx, path, image):
+        """
+        Inimigo sem passar pelo construtor, para quem vai preencher o estado
+        logo em seguida (snapshot.loads). Não consulta o caminho nem o
+        sprite_cache e não sorteia no RNG: `path` e `image` vêm do chamador,
+        os mesmos para todos os inimigos da classe na partida. Distância,
+        segmento, posições, hp, speed, reward e wave ficam por conta dele.
+        """
+        enemy = cls.__new__(cls)
+        pygame.sprite.Sprite.__init__(enemy)
+        enemy.ctx = ctx
+        enemy.path = path
+        enemy.pending_damage = 0
+        enemy.image = image
+        enemy.rect = image.get_rect()
+        return enemy
 
-        # Próximo waypoint (em base)
-        target_base = self.base_path[self.waypoint + 1]
-        dx = target_base[0] - self.pos_base[0]
-        dy = target_base[1] - self.pos_base[1]
-        dist = math.hypot(dx, dy)
+    @property
+    def progress(self):
+        """Fração do caminho já percorrida (0.0 → 1.0)."""
+        return self.distance / self.path.length if self.path.length else 1.0
 
-        if dist < self.speed:
-            self.waypoint += 1
-        else:
-            self.pos_base[0] += dx / dist * self.speed
-            self.pos_base[1] += dy / dist * self.speed
+    def update(self, dt):
+        """
+        dt: duração do tick em segundos de simulação.
+        O rect de tela é atualizado pelo renderizador (Simulation.interpolate).
+        """
+        # Se já chegou ao fim do caminho, reduz vida e mata o sprite
+        if self.distance >= self.path.length:
+            self.ctx.state.lose_life()
+            self.kill()
+            return
 
-        # Converte posição base → posição em tela (via SCALE_X e SCALE_Y)
-        from config import SCALE_X, SCALE_Y
-        real_x = int(self.pos_base[0] * SCALE_X)
-        real_y = int(self.pos_base[1] * SCALE_Y)
-        self.rect.center = (real_x, real_y)
+        self.prev_pos_base = (self.pos_base[0], self.pos_base[1])
+        self.distance += self.speed * dt
+        self.segment = self.path.advance_segment(self.distance, self.segment)
+        x, y = self.path.position(self.distance, self.segment)
+        self.pos_base[0] = x
+        self.pos_base[1] = y
 
     def take_damage(self, dmg):
         self.hp -= dmg
         if self.hp <= 0:
             self.kill()
-            game_state.earn(self.reward)
+            self.ctx.state.earn(self.reward)
 
 class BasicEnemy(Enemy):
-    def __init__(self, level_index=0):
-        super().__init__(level_index)
+    IMAGE = "assets/enemy_basic.png"
+
+    def __init__(self, ctx):
+        super().__init__(ctx)
         self.hp = 5
-        self.speed = 1.0 + random.uniform(0, 0.3)
+        self.speed = 60.0 + ctx.rng.uniform(0, 18.0)
         self.reward = ENEMY_REWARD["BasicEnemy"]
 
-        img = pygame.image.load("assets/enemy_basic.png").convert_alpha()
-        # 1) escala para (ENEMY_BASE_SIZE × ENEMY_BASE_SIZE)
-        img = pygame.transform.scale(img, (ENEMY_BASE_SIZE, ENEMY_BASE_SIZE))
-        # 2) escala para (ENEMY_BASE_SIZE × SCALE)
-        size = max(int(ENEMY_BASE_SIZE * SCALE), 1)
-        self.image = pygame.transform.scale(img, (size, size))
+        # Sprite decodificado uma única vez e escalado para (ENEMY_BASE_SIZE × SCALE)
+        self.image = ctx.sprite(self.IMAGE, ENEMY_BASE_SIZE)
         self.rect = self.image.get_rect()
 
 class FastEnemy(Enemy):
-    def __init__(self, level_index=0):
-        super().__init__(level_index)
+    IMAGE = "assets/enemy_fast.png"
+
+    def __init__(self, ctx):
+        super().__init__(ctx)
         self.hp = 3
-        self.speed = 2.0
+        self.speed = 120.0
         self.reward = ENEMY_REWARD["FastEnemy"]
 
-        img = pygame.image.load("assets/enemy_fast.png").convert_alpha()
-        img = pygame.transform.scale(img, (ENEMY_BASE_SIZE, ENEMY_BASE_SIZE))
-        size = max(int(ENEMY_BASE_SIZE * SCALE), 1)
-        self.image = pygame.transform.scale(img, (size, size))
+        self.image = ctx.sprite(self.IMAGE, ENEMY_BASE_SIZE)
         self.rect = self.image.get_rect()
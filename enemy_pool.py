@@ -0,0 +1,316 @@
+# enemy_pool.py
+
+from itertools import compress
+
+import pygame
+
+import paths
+
+try:
+    import numpy as np
+except ImportError:  # NumPy é opcional: só este módulo depende dele
+    np = None
+
+
+class EnemyPool:
+    """
+    Motor vetorizado (structure-of-arrays) para o movimento de inimigos.
+
+    Em vez de um Sprite por inimigo, distância percorrida, posição,
+    velocidade, HP e recompensa ficam em arrays NumPy contíguos; cada tick
+    avança TODOS os inimigos do caminho com poucas operações de array sobre
+    a paths.PathTable do nível. Escapes (chegar ao fim de paths.PATHS) e
+    mortes (hp <= 0) também são detectados em lote. As trajetórias são as
+    mesmas do Enemy.update() por sprite.
+
+    Os inimigos ativos ocupam sempre as primeiras `len(pool)` posições dos
+    arrays, na ordem de spawn; removidos são compactados ao fim do tick.
+    """
+
+    def __init__(self, level_index=0, capacity=1024, state=None):
+        """
+        level_index: caminho de paths.PATHS percorrido por todos do pool.
+        capacity: tamanho inicial dos arrays (cresce ×2 quando necessário).
+        state: GameState que recebe vidas perdidas e recompensas (opcional).
+        """
+        if np is None:
+            raise ImportError("EnemyPool requer NumPy (pip install numpy)")
+
+        self.level_index = level_index
+        self.state = state
+        table = paths.get_path_table(level_index)
+        self.length = table.length
+        self._cum = np.asarray(table.cum, dtype=np.float64)
+        self._points = np.asarray(table.points, dtype=np.float64)
+        self._dirs = np.asarray(table.dirs or [(0.0, 0.0)], dtype=np.float64)
+        self._last_segment = max(table.num_segments - 1, 0)
+        self.count = 0
+        self._next_id = 0
+        self._alloc(max(int(capacity), 1))
+
+    def _alloc(self, capacity):
+        """(Re)aloca os arrays preservando os `count` inimigos ativos."""
+        n = self.count
+        old = getattr(self, "x", None)
+        fields = {
+            "distance": np.float64, "x": np.float64, "y": np.float64,
+            "speed": np.float64, "hp": np.float64, "reward": np.int64,
+            "ids": np.int64,
+        }
+        for name, dtype in fields.items():
+            arr = np.zeros(capacity, dtype=dtype)
+            if old is not None:
+                arr[:n] = getattr(self, name)[:n]
+            setattr(self, name, arr)
+        self.capacity = capacity
+
+    def __len__(self):
+        return self.count
+
+    # ===============================
+    # SPAWN E DANO
+    # ===============================
+    def spawn(self, speed, hp, reward):
+        """Adiciona um inimigo no início do caminho. Retorna o id estável dele."""
+        return int(self.spawn_many(1, speed, hp, reward)[0])
+
+    def spawn_many(self, quantity, speed, hp, reward):
+        """
+        Adiciona `quantity` inimigos de uma vez. `speed` (px base/s) pode ser
+        escalar ou array (ex.: 60 + rng.uniform(0, 18, quantity) p/ BasicEnemy).
+        Retorna o array de ids criados.
+        """
+        n = self.count
+        if n + quantity > self.capacity:
+            cap = self.capacity
+            while cap < n + quantity:
+                cap *= 2
+            self._alloc(cap)
+
+        sl = slice(n, n + quantity)
+        self.distance[sl] = 0.0
+        self.x[sl] = self._points[0, 0]
+        self.y[sl] = self._points[0, 1]
+        self.speed[sl] = speed
+        self.hp[sl] = hp
+        self.reward[sl] = reward
+        ids = np.arange(self._next_id, self._next_id + quantity, dtype=np.int64)
+        self.ids[sl] = ids
+        self._next_id += quantity
+        self.count = n + quantity
+        return ids
+
+    def apply_damage(self, indices, amounts):
+        """
+        Aplica dano em lote. `indices` são posições nos arrays ativos
+        (0..len-1), com repetições permitidas (vários tiros no mesmo alvo).
+        As mortes são recolhidas no próximo step().
+        """
+        np.subtract.at(self.hp[:self.count], indices, amounts)
+
+    def clear(self):
+        """Remove todos os inimigos (os arrays continuam alocados)."""
+        self.count = 0
+
+    # ===============================
+    # TICK
+    # ===============================
+    def advance(self, dt):
+        """
+        Move os inimigos ativos `dt` segundos, sem contabilizar nem remover
+        ninguém. Retorna (leaked, dead, seg): máscaras dos que escaparam e
+        dos que tinham hp <= 0 no começo do tick, e o segmento do caminho
+        em que cada um está agora.
+        Mesma regra do Enemy.update(): quem já estava no fim escapa; os
+        demais andam `speed × dt` ao longo do caminho.
+        """
+        n = self.count
+        dist = self.distance[:n]
+        hp = self.hp[:n]
+
+        # Mortes de dano aplicado desde o último tick (como take_damage)
+        dead = hp <= 0
+
+        # Escapes: já estavam no fim do caminho no começo do tick
+        leaked = (dist >= self.length) & ~dead
+
+        moving = ~(dead | leaked)
+        dist += np.where(moving, self.speed[:n] * dt, 0.0)
+
+        # Posição = waypoint do segmento + direção × distância dentro dele
+        seg = np.searchsorted(self._cum, dist, side="right") - 1
+        np.clip(seg, 0, self._last_segment, out=seg)
+        t = dist - self._cum[seg]
+        self.x[:n] = self._points[seg, 0] + self._dirs[seg, 0] * t
+        self.y[:n] = self._points[seg, 1] + self._dirs[seg, 1] * t
+        return leaked, dead, seg
+
+    def step(self, dt):
+        """
+        Avança um tick de `dt` segundos de simulação. Retorna (escapados, mortos): quantos inimigos
+        chegaram ao fim do caminho e quantos tinham hp <= 0.
+        """
+        n = self.count
+        if n == 0:
+            return 0, 0
+
+        leaked, dead, _ = self.advance(dt)
+        n_leaked = int(np.count_nonzero(leaked))
+        n_dead = int(np.count_nonzero(dead))
+
+        if self.state is not None:
+            for _ in range(n_leaked):
+                self.state.lose_life()
+            if n_dead:
+                self.state.earn(int(self.reward[:n][dead].sum()))
+
+        if n_leaked or n_dead:
+            self._compact(~(leaked | dead))
+        return n_leaked, n_dead
+
+    def _compact(self, keep):
+        """Remove os inimigos fora de `keep`, preservando a ordem de spawn."""
+        n = self.count
+        k = int(np.count_nonzero(keep))
+        for arr in (self.distance, self.x, self.y, self.speed, self.hp, self.reward, self.ids):
+            arr[:k] = arr[:n][keep]
+        self.count = k
+
+    # ===============================
+    # LEITURA (MIRA / DESENHO)
+    # ===============================
+    def positions(self):
+        """Array (len, 2) com as posições base dos inimigos ativos (cópia)."""
+        return np.column_stack((self.x[:self.count], self.y[:self.count]))
+
+    def in_range(self, cx, cy, radius):
+        """Índices ativos a até `radius` de (cx, cy), via distância ao quadrado."""
+        n = self.count
+        dx = self.x[:n] - cx
+        dy = self.y[:n] - cy
+        return np.flatnonzero(dx * dx + dy * dy <= radius * radius)
+
+    def draw(self, surface, image, scale_x=1.0, scale_y=1.0):
+        """Desenha todos com a mesma `image`, numa única chamada a surface.blits()."""
+        n = self.count
+        if n == 0:
+            return
+        w, h = image.get_size()
+        xs = (self.x[:n] * scale_x).astype(np.int64) - w // 2
+        ys = (self.y[:n] * scale_y).astype(np.int64) - h // 2
+        surface.blits([(image, (int(px), int(py))) for px, py in zip(xs, ys)], False)
+
+
+class EnemyGroup(pygame.sprite.RenderUpdates):
+    """
+    O grupo de inimigos da partida no modo "pool": um RenderUpdates comum
+    que avisa o EnemyEngine de cada sprite que entra (spawn, snapshot) ou
+    sai (kill, empty), para ele atualizar o pool sem recarregar tudo.
+    """
+
+    def __init__(self, engine):
+        super().__init__()
+        self.engine = engine
+
+    def add_internal(self, sprite, layer=None):
+        super().add_internal(sprite, layer)
+        self.engine._added(sprite)
+
+    def remove_internal(self, sprite):
+        super().remove_internal(sprite)
+        self.engine._removed(sprite)
+
+
+class EnemyEngine:
+    """
+    Movimento dos inimigos de uma partida via EnemyPool (ENEMY_ENGINE =
+    "pool" em config.py), no lugar de Enemy.update() sprite a sprite.
+
+    Os Enemy continuam sendo os sprites da partida — torres, projéteis,
+    snapshot e desenho não mudam —, mas distância e velocidade de cada um
+    passam a viver nos arrays do pool, na mesma ordem do grupo. O grupo da
+    partida é self.group (um EnemyGroup), que registra entradas e saídas à
+    medida que acontecem. Cada step():
+      1. compacta no pool as vagas dos sprites que saíram do grupo
+         (EnemyPool._compact) e acrescenta no fim os que entraram;
+      2. avança todos de uma vez (EnemyPool.advance);
+      3. devolve distância, segmento e posição aos sprites, e cobra a
+         vida dos que escaparam (como Enemy.update()).
+    Só o passo 3 percorre os sprites em Python. As trajetórias são as
+    mesmas, bit a bit, do motor por sprite.
+    """
+
+    def __init__(self, ctx):
+        """ctx: GameContext da partida (nível atual e GameState das vidas)."""
+        self.ctx = ctx
+        self.pool = EnemyPool(ctx.level_index)
+        self.group = EnemyGroup(self)
+        self.sprites = []   # sprites na ordem dos arrays do pool
+        self._ids = {}      # sprite → id estável dele no pool (EnemyPool.ids)
+        self._new = {}      # entraram no grupo desde o último step (dict: ordem de entrada)
+        self._gone = []     # ids do pool de sprites que saíram do grupo
+
+    def _added(self, sprite):
+        self._new[sprite] = None
+
+    def _removed(self, sprite):
+        if sprite in self._new:
+            del self._new[sprite]  # entrou e saiu antes de chegar ao pool
+        else:
+            self._gone.append(self._ids.pop(sprite))
+
+    def _sync(self):
+        """Leva ao pool as entradas e saídas do grupo desde o último step()."""
+        pool = self.pool
+        if pool.level_index != self.ctx.level_index:
+            # Outro caminho: recomeça o pool com o que estiver no grupo
+            self.pool = pool = EnemyPool(self.ctx.level_index, pool.capacity)
+            self.sprites = []
+            self._ids.clear()
+            self._gone.clear()
+            self._new = dict.fromkeys(self.group.sprites())
+
+        gone = self._gone
+        if gone:
+            # Os ids crescem na ordem dos arrays (spawn no fim, compactação
+            # estável): a vaga de cada id sai por busca binária
+            slots = np.searchsorted(pool.ids[:pool.count], gone)
+            keep = np.ones(pool.count, dtype=bool)
+            keep[slots] = False
+            first = int(slots.min())
+            pool._compact(keep)
+            self.sprites[first:] = compress(self.sprites[first:], keep[first:].tolist())
+            gone.clear()
+
+        new = self._new
+        if new:
+            n0 = pool.count
+            k = len(new)
+            # HP e recompensa ficam nos sprites (take_damage): o pool só anda
+            ids = pool.spawn_many(k, np.fromiter((e.speed for e in new), np.float64, k), 1.0, 0)
+            pool.distance[n0:n0 + k] = np.fromiter((e.distance for e in new), np.float64, k)
+            self.sprites.extend(new)
+            self._ids.update(zip(new, ids.tolist()))
+            self._new = {}
+
+    def step(self, dt):
+        """Avança os inimigos de self.group em `dt` segundos de simulação."""
+        self._sync()
+        pool = self.pool
+        n = pool.count
+        if n == 0:
+            return
+
+        leaked, _, seg = pool.advance(dt)
+        for enemy, d, s, x, y in zip(self.sprites, pool.distance[:n].tolist(), seg.tolist(),
+                                     pool.x[:n].tolist(), pool.y[:n].tolist()):
+            pos = enemy.pos_base
+            enemy.prev_pos_base = (pos[0], pos[1])
+            enemy.distance = d
+            enemy.segment = s
+            pos[0] = x
+            pos[1] = y
+
+        for i in np.flatnonzero(leaked).tolist():
+            self.ctx.state.lose_life()
+            self.sprites[i].kill()
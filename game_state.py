@@ -3,6 +3,7 @@
 class GameState:
     """
     Gerencia dinheiro e vidas do jogador.
+    Cada partida tem o seu (context.GameContext.state); não há instância global.
     """
     def __init__(self):
         self.money = 0
@@ -20,4 +21,3 @@ class GameState:
     def lose_life(self):
         self.lives -= 1
 
-game_state = GameState()
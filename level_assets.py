@@ -0,0 +1,149 @@
+# level_assets.py
+
+from concurrent.futures import ThreadPoolExecutor
+
+import pygame
+
+import sprite_cache
+from config import BACKGROUND_FILES, LEVEL_PREFETCH
+from levels import LEVELS, wave_groups
+
+
+def level_sprites(level_index):
+    """Arquivos dos sprites de inimigo usados pelas waves de um nível."""
+    if level_index >= len(LEVELS):
+        return ()
+    return tuple(sorted({EnemyClass.IMAGE
+                         for wave in LEVELS[level_index]
+                         for EnemyClass, _, _, _ in wave_groups(wave)}))
+
+
+def _decode(file, size, sprite_paths):
+    """
+    Roda na thread de carregamento: decodifica o fundo (e já o escala para
+    `size`) e os sprites do nível. Nada aqui depende do modo de vídeo; o
+    convert() fica para a thread principal, em LevelAssets._install().
+    """
+    source = pygame.image.load(file)
+    scaled = source if source.get_size() == size else pygame.transform.scale(source, size)
+    sprites = {path: pygame.image.load(path) for path in sprite_paths}
+    return size, source, scaled, sprites
+
+
+class LevelAssets:
+    """
+    Fundos de nível (e sprites dos inimigos de cada nível) carregados sob
+    demanda, em vez de todos os BACKGROUND_FILES na abertura do jogo.
+
+    Só ficam na memória o nível atual e os LEVEL_PREFETCH seguintes
+    (retain). Esses próximos níveis são decodificados numa thread de
+    trabalho enquanto o atual é jogado; ready() diz se um nível já pode ser
+    exibido sem travar o frame, e background() o entrega — esperando pela
+    thread (ou carregando na hora) se ainda não estiver pronto.
+
+    Cada nível residente guarda o original em 1536×1024 e a versão no
+    tamanho de desenho atual (a mesma Surface quando os tamanhos coincidem,
+    como no modo "canvas"); set_size() reescala só os residentes.
+    """
+
+    def __init__(self, size, files=BACKGROUND_FILES, prefetch=LEVEL_PREFETCH):
+        """
+        size: tamanho de desenho dos fundos (canvas base ou janela).
+        prefetch: quantos níveis à frente do atual carregar em segundo plano.
+        """
+        self.size = tuple(size)
+        self.files = files
+        self.prefetch = prefetch
+        self._pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="level-assets")
+        self._pending = {}   # nível -> Future de _decode()
+        self._sources = {}   # nível -> fundo original (convertido)
+        self._scaled = {}    # nível -> fundo no tamanho `size`
+        self._sprites = {}   # nível -> arquivos de sprite registrados no sprite_cache
+
+    # ===============================
+    # CONSULTA
+    # ===============================
+    def ready(self, level_index):
+        """True se background(level_index) não vai bloquear."""
+        if level_index in self._scaled:
+            return True
+        future = self._pending.get(level_index)
+        return future is not None and future.done()
+
+    def background(self, level_index):
+        """Fundo do nível no tamanho atual (carrega agora se preciso)."""
+        img = self._scaled.get(level_index)
+        if img is None:
+            future = self._pending.pop(level_index, None)
+            if future is None:
+                result = _decode(self.files[level_index], self.size, level_sprites(level_index))
+            else:
+                result = future.result()
+            img = self._install(level_index, *result)
+        return img
+
+    # ===============================
+    # CARREGAMENTO E DESCARTE
+    # ===============================
+    def request(self, level_index):
+        """Agenda o carregamento do nível na thread (se ainda não estiver na memória)."""
+        if not 0 <= level_index < len(self.files):
+            return
+        if level_index in self._scaled or level_index in self._pending:
+            return
+        self._pending[level_index] = self._pool.submit(
+            _decode, self.files[level_index], self.size, level_sprites(level_index))
+
+    def retain(self, level_index):
+        """
+        Nível atual passa a ser `level_index`: descarta os fundos e sprites de
+        níveis fora de [atual, atual + prefetch] e agenda os próximos.
+        """
+        keep = set(range(level_index, level_index + self.prefetch + 1))
+        for level in list(self._scaled):
+            if level not in keep:
+                del self._scaled[level]
+                del self._sources[level]
+                self._sprites.pop(level, None)
+        for level in list(self._pending):
+            if level not in keep:
+                self._pending.pop(level).cancel()
+
+        in_use = {path for paths in self._sprites.values() for path in paths}
+        for path in {path for level in range(len(self.files)) if level not in keep
+                     for path in level_sprites(level)} - in_use:
+            sprite_cache.discard(path)
+
+        for level in sorted(keep):
+            self.request(level)
+
+    def set_size(self, size):
+        """Novo tamanho de desenho (VIDEORESIZE no modo "window")."""
+        size = tuple(size)
+        if size == self.size:
+            return
+        self.size = size
+        for level, source in self._sources.items():
+            self._scaled[level] = source if source.get_size() == size else pygame.transform.scale(source, size)
+
+    def close(self):
+        """Encerra a thread de carregamento (carregamentos pendentes são cancelados)."""
+        self._pool.shutdown(wait=False, cancel_futures=True)
+        self._pending.clear()
+
+    def _install(self, level_index, size, source, scaled, sprites):
+        """Converte o resultado de _decode() na thread principal e o guarda."""
+        source = source.convert()
+        if size != self.size:
+            # A janela mudou de tamanho enquanto a thread trabalhava
+            scaled = source if source.get_size() == self.size else pygame.transform.scale(source, self.size)
+        elif scaled.get_size() == source.get_size():
+            scaled = source
+        else:
+            scaled = scaled.convert()
+        for path, img in sprites.items():
+            sprite_cache.add_source(path, img)
+        self._sources[level_index] = source
+        self._scaled[level_index] = scaled
+        self._sprites[level_index] = tuple(sprites)
+        return scaled
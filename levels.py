@@ -1,8 +1,7 @@
 # levels.py
 
-import pygame
-import random
 from enemies import BasicEnemy, FastEnemy
+from scheduler import Scheduler
 from config import (
     INTRA_WAVE_DELAY,
     INTRA_WAVE_RANDOM,
@@ -10,116 +9,134 @@ from config import (
     INTER_WAVE_RANDOM
 )
 
+def wave_groups(wave):
+    """
+    Normaliza a definição de uma wave numa lista de grupos paralelos
+    (EnemyClass, quantidade, intervalo_ms, atraso_ms).
+
+    Formatos aceitos em LEVELS:
+      (EnemyClass, qtd)                          → um grupo, intervalo padrão
+      (EnemyClass, qtd, intervalo)               → um grupo, intervalo próprio
+      [(EnemyClass, qtd[, intervalo[, atraso]]), …] → grupos simultâneos
+    intervalo=None usa INTRA_WAVE_DELAY; atraso é contado do início da wave.
+    """
+    if isinstance(wave, tuple):
+        wave = [wave]
+    groups = []
+    for group in wave:
+        EnemyClass, quantity, *rest = group
+        interval = rest[0] if len(rest) > 0 and rest[0] is not None else INTRA_WAVE_DELAY
+        delay = rest[1] if len(rest) > 1 else 0
+        groups.append((EnemyClass, quantity, interval, delay))
+    return groups
+
+
+def wave_size(wave):
+    """Total de inimigos de uma wave (somando todos os grupos)."""
+    return sum(quantity for _, quantity, _, _ in wave_groups(wave))
+
+
 class LevelManager:
     """
     Gerencia spawn de inimigos em “ondas” (waves) com:
-      - intervalo entre cada inimigo em uma mesma onda (intra-wave),
+      - um fluxo de spawn por grupo da wave (vários tipos ao mesmo tempo,
+        cada um com seu intervalo e atraso inicial),
       - intervalo entre o fim de uma onda e o início da próxima (inter-wave),
       - randomização leve nesses intervalos.
+    Tudo em tempo de simulação (ms), numa agenda de eventos (scheduler.Scheduler):
+      ("spawn", i) → próximo inimigo do fluxo i da wave atual
+      ("wave", n)  → início da wave n (ou fim do nível, se não houver)
     """
 
-    def __init__(self, waves):
+    def __init__(self, ctx, waves):
         """
-        waves: lista de tuplas [(EnemyClass, quantidade), …]
+        ctx: GameContext da partida (RNG do jitter, grupo onde os inimigos
+        entram; o contexto também é repassado a cada inimigo criado).
+        waves: lista de waves (ver wave_groups para os formatos)
         """
+        self.ctx = ctx
         self.waves = waves
         self.current_wave = 0
-        # Evento único para todos os spawns
-        self.spawn_event = pygame.USEREVENT + 1
         self.finished = False
 
         # Estado interno:
-        self._intra_queue = []            # fila de EnemyClasses a spawnar na wave atual
-        self._waiting_inter_delay = False # sinaliza se estamos aguardando inter-wave
+        self.scheduler = Scheduler()
+        # Fluxos da wave atual: [EnemyClass, restantes, intervalo_ms]
+        self.streams = []
+        self.active_streams = 0   # fluxos que ainda têm inimigos a spawnar
 
-    def start_level(self):
+    def start_level(self, now=0):
         """
-        Inicia o level: prepara a primeira wave e agenda o primeiro spawn.
+        Inicia o level: prepara a primeira wave e agenda seus primeiros spawns.
+        now: tempo de simulação atual (ms).
         """
         self.current_wave = 0
         self.finished = False
-        self._waiting_inter_delay = False
-
-        # Prepara a fila da primeira wave
-        self._prepare_wave()
-        # Agenda o primeiro spawn (intra-wave)
-        self._schedule_next_spawn()
-
-    def _prepare_wave(self):
-        """
-        Carrega _intra_queue com N cópias de EnemyClass da wave atual.
-        """
-        EnemyClass, quantity = self.waves[self.current_wave]
-        self._intra_queue = [EnemyClass] * quantity
-
-    def _schedule_next_spawn(self):
+        self.scheduler.clear()
+        self._start_wave(now)
+
+    def _start_wave(self, at):
+        """Cria um fluxo por grupo da wave atual e agenda o 1º spawn de cada."""
+        self.streams = []
+        self.active_streams = 0
+        for EnemyClass, quantity, interval, delay in wave_groups(self.waves[self.current_wave]):
+            index = len(self.streams)
+            self.streams.append([EnemyClass, quantity, interval])
+            if quantity > 0:
+                self.active_streams += 1
+                self.scheduler.schedule(at + delay + self._intra_interval(interval), ("spawn", index))
+        if self.active_streams == 0:
+            self._end_wave(at)
+
+    def _intra_interval(self, base):
+        """Intervalo entre inimigos de um fluxo: base ± INTRA_WAVE_RANDOM."""
+        jitter = self.ctx.rng.uniform(-INTRA_WAVE_RANDOM, INTRA_WAVE_RANDOM)
+        return max(int(base + jitter), 50)
+
+    def _end_wave(self, at):
+        """Último inimigo da wave saiu: agenda a próxima após o intervalo inter-wave."""
+        jitter = self.ctx.rng.uniform(-INTER_WAVE_RANDOM, INTER_WAVE_RANDOM)
+        interval = max(int(INTER_WAVE_DELAY + jitter), 100)
+        self.scheduler.schedule(at + interval, ("wave", self.current_wave + 1))
+
+    def update(self, now):
         """
-        Agenda o próximo evento self.spawn_event após um intervalo calculado:
-          - Se ainda houver inimigos em _intra_queue, intervalo intra-wave:
-            INTRA_WAVE_DELAY ± INTRA_WAVE_RANDOM
-          - Senão, se houver próxima wave, intervalo inter-wave:
-            INTER_WAVE_DELAY ± INTER_WAVE_RANDOM
+        Dispara todos os eventos vencidos até `now` (ms de simulação).
+        Cada evento agenda o seguinte a partir do seu próprio instante,
+        então um passo grande não perde nem atrasa spawns.
         """
-        # Desliga qualquer timer anterior para evitar duplicatas
-        pygame.time.set_timer(self.spawn_event, 0)
-
-        if self._intra_queue:
-            # Ainda há inimigos nesta wave → intervalo intra-wave
-            base = INTRA_WAVE_DELAY
-            jitter = random.uniform(-INTRA_WAVE_RANDOM, INTRA_WAVE_RANDOM)
-            interval = max(int(base + jitter), 50)
-        else:
-            # Fim da wave atual → se houver próxima wave, intervalo inter-wave
-            base = INTER_WAVE_DELAY
-            jitter = random.uniform(-INTER_WAVE_RANDOM, INTER_WAVE_RANDOM)
-            interval = max(int(base + jitter), 100)
-
-        pygame.time.set_timer(self.spawn_event, interval)
-
-    def spawn_next(self, enemies_group, level_index=0):
-        """
-        Chamado quando self.spawn_event é capturado no main loop:
-        1) Se _intra_queue não vazio → spawna 1 inimigo, depois agenda próximo intra-wave
-        2) Se _intra_queue vazio e _waiting_inter_delay == False → acabou a wave, inicia inter-wave
-        3) Se _waiting_inter_delay == True → inter-wave acabou, avança para próxima wave ou finaliza
-        """
-        # Desliga o timer atual para evitar múltiplos triggers
-        pygame.time.set_timer(self.spawn_event, 0)
-
-        # 1) Spawn individual dentro da wave
-        if self._intra_queue:
-            EnemyClass = self._intra_queue.pop(0)
-            enemies_group.add(EnemyClass(level_index))
-
-            # Se ainda restam inimigos nesta wave, agenda próximo intra-wave
-            if self._intra_queue:
-                self._schedule_next_spawn()
-            else:
-                # Esta wave terminou; agora aguardaremos o intervalo inter-wave
-                self._waiting_inter_delay = True
-                self._schedule_next_spawn()
-            return
-
-        # 2) Se _intra_queue está vazio e estamos aguardando inter-wave
-        if self._waiting_inter_delay:
-            self._waiting_inter_delay = False
-            self.current_wave += 1
-
-            if self.current_wave < len(self.waves):
-                # Há próxima wave: prepara e spawna o primeiro inimigo
-                self._prepare_wave()
-                self._schedule_next_spawn()
+        for at, (kind, index) in self.scheduler.pop_due(now):
+            if kind == "spawn":
+                self._spawn(at, index)
             else:
-                # Não há mais waves: marca nível como finalizado
-                self.finished = True
-            return
-
-        # 3) Senão (possível chamada indevida), não faz nada
-        return
+                self.current_wave = index
+                if index < len(self.waves):
+                    self._start_wave(at)
+                else:
+                    # Não há mais waves: marca nível como finalizado
+                    self.finished = True
+
+    def _spawn(self, at, index):
+        stream = self.streams[index]
+        EnemyClass = stream[0]
+        enemy = EnemyClass(self.ctx)
+        enemy.wave = self.current_wave
+        self.ctx.enemies.add(enemy)
+
+        stream[1] -= 1
+        if stream[1] > 0:
+            self.scheduler.schedule(at + self._intra_interval(stream[2]), ("spawn", index))
+        else:
+            self.active_streams -= 1
+            if self.active_streams == 0:
+                self._end_wave(at)
 
 
 # === Definição das ondas em cada nível ===
-# Cada nível é uma LISTA DE TUPLAS (ClasseDeInimigo, quantidade)
+# Cada nível é uma LISTA DE WAVES. Uma wave pode ser:
+#   (ClasseDeInimigo, quantidade[, intervalo_ms])        → um único fluxo
+#   [(Classe, qtd, intervalo_ms, atraso_ms), …]          → fluxos em paralelo
+# (intervalo None = INTRA_WAVE_DELAY; atraso contado do início da wave)
 LEVELS = [
     # ===== Level 1 =====
     [
@@ -132,6 +149,10 @@ LEVELS = [
     [
         (BasicEnemy, 4),
         (FastEnemy, 4),
+        [
+            (BasicEnemy, 6, 900),         # wave 3: BasicEnemy a cada ~0,9 s…
+            (FastEnemy, 3, 1500, 2000),   # …e FastEnemy junto, começando 2 s depois
+        ],
     ],
 
     # Você pode adicionar mais níveis seguindo o mesmo formato
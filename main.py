@@ -1,72 +1,155 @@
 # main.py
 
-import pygame
+import time
+_started_at = time.perf_counter()   # marco zero do relatório de abertura
+
+import os
 import sys
+import random
+import pygame
 import pygame.freetype
 
+import config
 from config import (
-    SCREEN_WIDTH,
-    SCREEN_HEIGHT,
+    BASE_WIDTH,
+    BASE_HEIGHT,
     FPS,
     BACKGROUND_FILES,
-    BG_COLOR,
-    INITIAL_MONEY,
-    SCALE,
-    SCALE_X,
-    SCALE_Y,
     ICON_BASE_SIZE,
     update_screen_size,
-    DRAW_PATH
+    SPEED_MULTIPLIERS,
+    RECORD_REPLAYS,
+    REPLAY_DIR,
+    QUICKSAVE_FILE,
+    COVERAGE_PREVIEW_COLOR,
+    RENDER_MODE,
+    RESIZE_DEBOUNCE_MS,
+    LOADING_TEXT_COLOR,
+    STARTUP_REPORT
 )
-from game_state import game_state
-from levels import LevelManager, LEVELS
-from towers import BasicTower, SniperTower
-from enemies import BasicEnemy, FastEnemy
-from bullets import BasicBullet
-import paths   # contém PATHS em base 1536×1024
+from towers import BasicTower, SniperTower, TARGET_POLICIES
+from simulation import Simulation, FixedStepper
+from renderer import Renderer
+from level_assets import LevelAssets
+from text_cache import TextCache
+from profiler import FrameProfiler, PhaseTimer, startup_lines
+import paths
+import sprite_cache
+# replay e snapshot só são importados quando usados (gravação ligada, F5/F9)
+
+def build_menu_layout(fonte, text_cache, menu_lines, padding_x, padding_y, line_spacing):
+    """
+    Mede o balão do menu de torres: textos renderizados, largura, altura,
+    altura de linha e o fundo semi-transparente. Só muda com o tamanho da
+    fonte, então é calculado uma vez por tamanho (e não a cada frame/clique).
+    """
+    rendered_texts = [
+        text_cache.render(fonte, f"{name} (${cost})", (255, 255, 255))
+        for name, cost in menu_lines
+    ]
+    max_text_width = max(surf.get_width() for surf in rendered_texts)
+    text_height = max(surf.get_height() for surf in rendered_texts)
+
+    menu_width = max_text_width + 2 * padding_x
+    menu_height = len(menu_lines) * text_height + 2 * padding_y + (len(menu_lines) - 1) * line_spacing
+
+    overlay = pygame.Surface((menu_width, menu_height), pygame.SRCALPHA)
+    overlay.fill((0, 0, 0, 180))
+
+    return {
+        "font_size": fonte.size,
+        "texts": rendered_texts,
+        "width": menu_width,
+        "height": menu_height,
+        "line_h": text_height + line_spacing,
+        "overlay": overlay,
+    }
 
 def main():
-    pygame.init()
+    # Abertura medida por etapa até o primeiro frame (STARTUP_REPORT)
+    startup = PhaseTimer()
+    startup.start(at=_started_at)
+    startup.lap("imports")
+
+    # Só vídeo e fontes: pygame.init() também abriria áudio e joysticks,
+    # que o jogo não usa
+    pygame.display.init()
+    pygame.freetype.init()
 
     # Cria janela redimensionável
     screen = pygame.display.set_mode(
-        (SCREEN_WIDTH, SCREEN_HEIGHT),
+        (config.SCREEN_WIDTH, config.SCREEN_HEIGHT),
         pygame.RESIZABLE
     )
     pygame.display.set_caption("Tower Defense Modular (Redimensionável)")
     clock = pygame.time.Clock()
-    fonte = pygame.freetype.SysFont(None, max(int(24 * SCALE), 1))
+
+    # Escala base → superfície de desenho. No modo "canvas" tudo é desenhado
+    # em px base (escala 1) e o Renderer escala o frame pronto para a janela;
+    # no modo "window" a escala acompanha o tamanho da janela.
+    canvas_mode = RENDER_MODE == "canvas"
+    if canvas_mode:
+        scale_x = scale_y = scale = 1.0
+        view_size = (BASE_WIDTH, BASE_HEIGHT)
+    else:
+        scale_x, scale_y, scale = config.SCALE_X, config.SCALE_Y, config.SCALE
+        view_size = screen.get_size()
+    # Resize aguardando o fim da rajada de eventos (ver RESIZE_DEBOUNCE_MS)
+    pending_size = None
+    resize_at = 0
+
+    startup.lap("janela")
 
     # ===============================
-    # 1) CARREGA MAPAS (FUNDOS) E ARMAZENA IMAGENS ORIGINAIS
+    # 1) MAPAS (FUNDOS): CARREGADOS SOB DEMANDA
     # ===============================
-    background_srcs = []
-    for file in BACKGROUND_FILES:
-        bg_src = pygame.image.load(file).convert()  # original 1536×1024
-        background_srcs.append(bg_src)
+    # Só o nível atual é decodificado agora — já na thread, enquanto o resto
+    # da abertura roda; o próximo vem enquanto este é jogado (LevelAssets)
+    assets = LevelAssets(view_size)
+    assets.request(0)
 
-    # Escalonamos pela primeira vez para a resolução inicial
-    background_imgs = []
-    for bg_src in background_srcs:
-        bg_scaled = pygame.transform.scale(bg_src, (SCREEN_WIDTH, SCREEN_HEIGHT))
-        background_imgs.append(bg_scaled)
+    # Fonte padrão embutida no pygame: SysFont(None) chegaria nela também,
+    # mas só depois de varrer as fontes do sistema. O mesmo objeto é
+    # reaproveitado em todos os tamanhos (resize só troca fonte.size)
+    fonte = pygame.freetype.Font(None, max(int(24 * scale), 1))
+    startup.lap("fonte")
 
     current_level = 0
     max_level_index = len(BACKGROUND_FILES) - 1
+    loading_level = None   # nível pedido pelo botão cujo fundo ainda carrega
 
     # ===============================
-    # 2) PREPARA LevelManager PARA AS ONDAS DO NÍVEL ATUAL
-    # ===============================
-    level_manager = LevelManager(LEVELS[current_level])
-    level_manager.start_level()
-    SPAWN_ENEMY = level_manager.spawn_event
-
-    # ===============================
-    # 3) GRUPOS DE SPRITES
+    # 2) SIMULAÇÃO (ONDAS, GRUPOS DE SPRITES E GameState)
     # ===============================
-    enemies = pygame.sprite.Group()
-    towers  = pygame.sprite.Group()
-    bullets = pygame.sprite.Group()
+    # Toda a lógica vive em Simulation; aqui só tratamos entrada e desenho.
+    # Semente explícita: com ela (e as ações gravadas) a partida é reproduzível
+    sim = Simulation(current_level, seed=random.randrange(2 ** 32), scale=(scale_x, scale_y))
+    game_state = sim.game_state
+    # Ações do jogador passam pelo Recorder (mesma interface da Simulation),
+    # que as grava com o tick atual para o replay.py
+    recorder = None
+    if RECORD_REPLAYS:
+        from replay import Recorder
+        recorder = Recorder(sim)
+    actions = recorder if recorder is not None else sim
+    # Passo fixo: a lógica roda a SIM_TICK_RATE, independente do FPS de desenho
+    stepper = FixedStepper(sim)
+    speed_index = 0   # índice em SPEED_MULTIPLIERS (tecla F alterna)
+
+    sprite_groups = (sim.enemies, sim.towers, sim.bullets)
+    startup.lap("simulação")
+
+    # Instrumentação por fase (tecla F3 mostra/esconde o overlay)
+    profiler = FrameProfiler()
+    profiler.attach(sim)
+
+    def mouse_pos():
+        """Mouse nas coordenadas de desenho (px base no modo "canvas")."""
+        mx, my = pygame.mouse.get_pos()
+        if not canvas_mode:
+            return mx, my
+        w, h = pygame.display.get_surface().get_size()
+        return mx * BASE_WIDTH // w, my * BASE_HEIGHT // h
 
     selected_tower_type = BasicTower
 
@@ -74,11 +157,11 @@ def main():
     # 4) CONFIGURA BOTÃO “PRÓXIMA FASE”
     # ===============================
     show_next_button = False
-    btn_w = max(int(170 * SCALE), 1)
-    btn_h = max(int(30  * SCALE), 1)
+    btn_w = max(int(170 * scale), 1)
+    btn_h = max(int(30  * scale), 1)
     button_rect = pygame.Rect(
-        SCREEN_WIDTH - btn_w - max(int(10 * SCALE), 1),
-        max(int(10 * SCALE), 1),
+        view_size[0] - btn_w - max(int(10 * scale), 1),
+        max(int(10 * scale), 1),
         btn_w,
         btn_h
     )
@@ -94,9 +177,18 @@ def main():
         ("Basic Tower", BasicTower.COST),
         ("Sniper Tower", SniperTower.COST),
     ]
-    menu_padding_x = max(int(16 * SCALE), 1)
-    menu_padding_y = max(int(8  * SCALE), 1)
-    line_spacing  = max(int(6  * SCALE), 1)
+    menu_padding_x = max(int(16 * scale), 1)
+    menu_padding_y = max(int(8  * scale), 1)
+    line_spacing  = max(int(6  * scale), 1)
+
+    # Textos renderizados ficam num cache LRU; o layout do menu é refeito
+    # só quando o tamanho da fonte muda.
+    text_cache = TextCache()
+    menu_layout = build_menu_layout(fonte, text_cache, menu_lines, menu_padding_x, menu_padding_y, line_spacing)
+
+    # HUD: superfícies de dinheiro/vidas refeitas só quando os valores mudam
+    hud_values = None
+    hud_money_surf = hud_lives_surf = None
 
     # ===============================
     # 6) CARREGA ÍCONES DE DINHEIRO E VIDA (ARMAZENA ORIGINAIS)
@@ -111,20 +203,23 @@ def main():
     except:
         icon_life_src  = pygame.Surface((1, 1), pygame.SRCALPHA)
 
-    # Redimensiona pela primeira vez para (ICON_BASE_SIZE × SCALE)
-    size_icon = max(int(ICON_BASE_SIZE * SCALE), 1)
+    # Redimensiona pela primeira vez para (ICON_BASE_SIZE × escala)
+    size_icon = max(int(ICON_BASE_SIZE * scale), 1)
     icon_money = pygame.transform.scale(icon_money_src, (size_icon, size_icon))
     icon_life  = pygame.transform.scale(icon_life_src,  (size_icon, size_icon))
+    startup.lap("interface")
 
-    # ===============================
-    # 7) INICIALIZA DINHEIRO E VIDAS
-    # ===============================
-    game_state.money = INITIAL_MONEY
-    game_state.lives = 10
+    # Camada estática (fundo + path) e desenho por retângulos sujos. Aqui o
+    # fundo do nível (pedido lá no início) costuma já estar decodificado
+    renderer = Renderer(canvas_size=view_size if canvas_mode else None)
+    renderer.rebuild_static(screen, assets.background(current_level), current_level)
+    assets.retain(current_level)
+    startup.lap("fundo")
 
     running = True
     while running:
-        dt = clock.tick(FPS)
+        frame_ms = clock.tick(FPS)
+        profiler.begin_frame()
         for event in pygame.event.get():
             # ———————————————
             # SAIR DO JOGO
@@ -136,95 +231,39 @@ def main():
             # ———————————————
             # REDIMENSIONAMENTO DA JANELA
             # ———————————————
+            # Arrastar a borda gera uma rajada de VIDEORESIZE: guarda só o
+            # último tamanho e aplica RESIZE_DEBOUNCE_MS depois do último evento
             if event.type == pygame.VIDEORESIZE:
-                new_w, new_h = event.w, event.h
-                if new_w < 200: new_w = 200
-                if new_h < 150: new_h = 150
-
-                # 1) Atualiza variáveis em config (SCALE_X, SCALE_Y, SCALE)
-                update_screen_size(new_w, new_h)
-
-                # 2) Redefine a janela para a nova resolução
-                screen = pygame.display.set_mode(
-                    (SCREEN_WIDTH, SCREEN_HEIGHT),
-                    pygame.RESIZABLE
-                )
-
-                # 3) Reescalona todos os mapas (originais em background_srcs)
-                background_imgs = []
-                for bg_src in background_srcs:
-                    bg_scaled = pygame.transform.scale(bg_src, (SCREEN_WIDTH, SCREEN_HEIGHT))
-                    background_imgs.append(bg_scaled)
-
-                # 4) Recalcula botão “Próxima Fase”
-                btn_w = max(int(170 * SCALE), 1)
-                btn_h = max(int(30  * SCALE), 1)
-                button_rect = pygame.Rect(
-                    SCREEN_WIDTH - btn_w - max(int(10 * SCALE), 1),
-                    max(int(10 * SCALE), 1),
-                    btn_w,
-                    btn_h
-                )
-
-                # 5) Reescalona ícones de HUD
-                size_icon = max(int(ICON_BASE_SIZE * SCALE), 1)
-                icon_money = pygame.transform.scale(icon_money_src, (size_icon, size_icon))
-                icon_life  = pygame.transform.scale(icon_life_src,  (size_icon, size_icon))
-
-                # 6) Recria a fonte na escala atual
-                fonte = pygame.freetype.SysFont(None, max(int(24 * SCALE), 1))
-
+                pending_size = (max(event.w, 200), max(event.h, 150))
+                resize_at = pygame.time.get_ticks() + RESIZE_DEBOUNCE_MS
                 continue  # segue para o próximo evento
 
-            # ———————————————
-            # SPAWN DE INIMIGOS (evento do LevelManager)
-            # ———————————————
-            if event.type == SPAWN_ENEMY:
-                # Gera o próximo spawn (intra‐wave ou inter‐wave)
-                level_manager.spawn_next(enemies, level_index=current_level)
-
             # ———————————————
             # CLIQUE ESQUERDO (BOTÃO 1)
             # ———————————————
             if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
-                mx, my = pygame.mouse.get_pos()
+                mx, my = mouse_pos()
 
                 # 7.1) Clique no botão “Próxima Fase”?
                 if (show_next_button
                     and (current_level < max_level_index)
                     and button_rect.collidepoint((mx, my))):
-                    # Avança para o próximo nível
-                    current_level += 1
-                    game_state.money = INITIAL_MONEY
-                    game_state.lives = 10
-                    towers.empty()
-                    bullets.empty()
-                    enemies.empty()
-                    level_manager = LevelManager(LEVELS[current_level])
-                    level_manager.start_level()
-                    SPAWN_ENEMY = level_manager.spawn_event
+                    # Avança para o próximo nível assim que o fundo dele
+                    # estiver carregado (ver 8.1)
+                    loading_level = current_level + 1
+                    assets.request(loading_level)
                     show_next_button = False
                     show_tower_menu = False
                     continue
 
                 # 7.2) Se o menu de torre já está aberto
                 if show_tower_menu:
-                    # Recalcular dimensões do balão
-                    max_text_width = 0
-                    text_height = 0
-                    rendered_texts = []
-                    for name, cost in menu_lines:
-                        txt = f"{name} (${cost})"
-                        surf, _ = fonte.render(txt, (255, 255, 255))
-                        rendered_texts.append(surf)
-                        max_text_width = max(max_text_width, surf.get_width())
-                        text_height = max(text_height, surf.get_height())
-
-                    menu_width = max_text_width + 2 * menu_padding_x
-                    menu_height = len(menu_lines) * text_height + 2 * menu_padding_y + (len(menu_lines) - 1) * line_spacing
-
-                    real_menu_x = int(click_x_base * SCALE_X) + max(int(10 * SCALE), 1)
-                    real_menu_y = int(click_y_base * SCALE_Y)
+                    # Dimensões do balão (pré-calculadas em menu_layout)
+                    menu_width = menu_layout["width"]
+                    menu_height = menu_layout["height"]
+
+                    real_menu_x = int(click_x_base * scale_x) + max(int(10 * scale), 1)
+                    real_menu_y = int(click_y_base * scale_y)
                     menu_rect = pygame.Rect(real_menu_x, real_menu_y, menu_width, menu_height)
 
                     # Se clicou fora do balão, fecha-o sem comprar
@@ -234,33 +273,29 @@ def main():
 
                     # Se clicou dentro, determina a linha que foi clicada
                     rel_y = my - real_menu_y - menu_padding_y
-                    line_h = text_height + line_spacing
+                    line_h = menu_layout["line_h"]
                     clicked_line = rel_y // line_h
                     if 0 <= clicked_line < len(menu_lines):
                         name, cost = menu_lines[int(clicked_line)]
-                        if game_state.can_afford(cost):
-                            game_state.spend(cost)
-                            if name == "Basic Tower":
-                                towers.add(BasicTower((click_x_base, click_y_base)))
-                            else:
-                                towers.add(SniperTower((click_x_base, click_y_base)))
+                        tower_class = BasicTower if name == "Basic Tower" else SniperTower
+                        actions.place_tower(tower_class, (click_x_base, click_y_base))
                         show_tower_menu = False
                     continue
 
-                # 7.3) Senão, abre o menu de seleção de torre
-                click_x_base = int(mx / SCALE_X)
-                click_y_base = int(my / SCALE_Y)
-                show_tower_menu = True
+                # 7.3) Senão, abre o menu de seleção de torre — só onde cabe
+                # uma torre (fora do caminho, de outras torres e da borda)
+                click_x_base = int(mx / scale_x)
+                click_y_base = int(my / scale_y)
+                show_tower_menu = sim.occupancy.can_place(click_x_base, click_y_base)
 
             # ———————————————
             # CLIQUE DIREITO (BOTÃO 3) = upgrade na torre sob o mouse
             # ———————————————
             if event.type == pygame.MOUSEBUTTONDOWN and event.button == 3:
-                mx, my = pygame.mouse.get_pos()
-                for torre in towers:
-                    if torre.rect.collidepoint((mx, my)):
-                        torre.upgrade()
-                        break
+                mx, my = mouse_pos()
+                torre = sim.tower_at((mx / scale_x, my / scale_y))
+                if torre is not None:
+                    actions.upgrade_tower(torre)
 
             # ———————————————
             # TECLAS 1 e 2 PARA SELEÇÃO RÁPIDA DE TORRE (OPCIONAL)
@@ -270,27 +305,115 @@ def main():
                     selected_tower_type = BasicTower
                 elif event.key == pygame.K_2:
                     selected_tower_type = SniperTower
+                # TECLA T: ALTERNA A POLÍTICA DE MIRA DA TORRE SOB O MOUSE
+                elif event.key == pygame.K_t:
+                    mx, my = mouse_pos()
+                    torre = sim.tower_at((mx / scale_x, my / scale_y))
+                    if torre is not None:
+                        i = TARGET_POLICIES.index(torre.policy)
+                        actions.set_target_policy(torre, TARGET_POLICIES[(i + 1) % len(TARGET_POLICIES)])
+                # TECLA F: ACELERAÇÃO (1× → 2× → 4× → 16× → sem limite → 1×)
+                elif event.key == pygame.K_f:
+                    speed_index = (speed_index + 1) % len(SPEED_MULTIPLIERS)
+                    stepper.speed = SPEED_MULTIPLIERS[speed_index]
+                # TECLA F3: PROFILER (tempos por fase + overlay)
+                elif event.key == pygame.K_F3:
+                    profiler.toggle()
+                    renderer.invalidate()
+                # F5 / F9: SALVA E CARREGA O JOGO (snapshot binário)
+                elif event.key == pygame.K_F5:
+                    import snapshot
+                    snapshot.save(sim, QUICKSAVE_FILE)
+                elif event.key == pygame.K_F9 and os.path.exists(QUICKSAVE_FILE):
+                    import snapshot
+                    with open(QUICKSAVE_FILE, "rb") as f:
+                        data = f.read()
+                    try:
+                        if recorder is not None:
+                            recorder.load_snapshot(data)
+                        else:
+                            snapshot.loads(data, sim)
+                    except snapshot.SnapshotError as err:
+                        # Ex.: quicksave gravado por uma versão anterior do jogo
+                        print(f"{QUICKSAVE_FILE}: {err}", file=sys.stderr)
+                        continue
+                    current_level = sim.level_index
+                    loading_level = None
+                    renderer.rebuild_static(screen, assets.background(current_level), current_level)
+                    assets.retain(current_level)
+                    stepper.accumulator = 0.0
+                    show_tower_menu = False
 
         # Se o usuário clicou em “quit”, break do while principal
         if not running:
             break
 
         # ===============================
-        # 8) ATUALIZAÇÃO DE SPRITES
+        # 7.9) APLICA O RESIZE PENDENTE (após a rajada de eventos)
         # ===============================
-        enemies.update()
-        towers.update()
-        bullets.update()
+        if pending_size is not None and pygame.time.get_ticks() >= resize_at:
+            new_w, new_h = pending_size
+            pending_size = None
+            screen = pygame.display.set_mode((new_w, new_h), pygame.RESIZABLE)
+
+            if canvas_mode:
+                # Canvas, sprites, fundos, ícones e fonte continuam em px base:
+                # só a escala final do Renderer.present() muda
+                renderer.invalidate()
+            else:
+                # 1) Atualiza variáveis em config (SCALE_X, SCALE_Y, SCALE)
+                update_screen_size(new_w, new_h)
+                scale_x, scale_y, scale = config.SCALE_X, config.SCALE_Y, config.SCALE
+                sprite_cache.evict_stale()
+                sim.ctx.set_scale(scale_x, scale_y)
+
+                # 2) Reescalona os mapas residentes (originais em LevelAssets)
+                assets.set_size(screen.get_size())
+                renderer.rebuild_static(screen, assets.background(current_level), current_level)
+
+                # 3) Recalcula botão “Próxima Fase”
+                btn_w = max(int(170 * scale), 1)
+                btn_h = max(int(30  * scale), 1)
+                button_rect = pygame.Rect(
+                    new_w - btn_w - max(int(10 * scale), 1),
+                    max(int(10 * scale), 1),
+                    btn_w,
+                    btn_h
+                )
+
+                # 4) Reescalona ícones de HUD
+                size_icon = max(int(ICON_BASE_SIZE * scale), 1)
+                icon_money = pygame.transform.scale(icon_money_src, (size_icon, size_icon))
+                icon_life  = pygame.transform.scale(icon_life_src,  (size_icon, size_icon))
+
+                # 5) Ajusta o tamanho da fonte e refaz o menu na escala atual
+                fonte.size = max(int(24 * scale), 1)
+                menu_padding_x = max(int(16 * scale), 1)
+                menu_padding_y = max(int(8  * scale), 1)
+                line_spacing  = max(int(6  * scale), 1)
+                menu_layout = build_menu_layout(fonte, text_cache, menu_lines, menu_padding_x, menu_padding_y, line_spacing)
+                hud_values = None
+        profiler.lap("events")
 
-        for torre in towers:
-            torre.try_shoot(enemies, bullets)
+        # ===============================
+        # 8) PASSOS DE SIMULAÇÃO (passo fixo) + INTERPOLAÇÃO PARA O DESENHO
+        # ===============================
+        stepper.advance(frame_ms)
+        sim.interpolate(stepper.alpha)
+        profiler.lap("interp")
+
+        # 8.1) TROCA DE NÍVEL PENDENTE: só quando o fundo já foi carregado
+        if loading_level is not None and assets.ready(loading_level):
+            current_level = loading_level
+            loading_level = None
+            actions.start_level(current_level)
+            renderer.rebuild_static(screen, assets.background(current_level), current_level)
+            assets.retain(current_level)
 
         # ===============================
         # 9) LÓGICA DO BOTÃO “PRÓXIMA FASE”
         # ===============================
-        if (level_manager.finished
-            and (len(enemies) == 0)
-            and (current_level < max_level_index)):
+        if sim.level_complete and (current_level < max_level_index) and loading_level is None:
             show_next_button = True
         else:
             show_next_button = False
@@ -299,87 +422,142 @@ def main():
         # 10) FASE DE DESENHO
         # ===============================
 
-        # 11) DESENHA O FUNDO DO NÍVEL ATUAL (mapa escalado)
-        if current_level <= max_level_index:
-            screen.blit(background_imgs[current_level], (0, 0))
-        else:
-            screen.fill(BG_COLOR)
-
-        # 12) DESENHA O “PATH” (caminho cinza) apenas se DRAW_PATH for True
-        from config import DRAW_PATH  # certifique-se de importar no topo do main.py, se ainda não importou
-        if DRAW_PATH and (current_level < len(paths.PATHS)):
-            paths.draw_path(current_level, screen)
+        # 11/12) FUNDO DO NÍVEL + “PATH”: vêm prontos da camada estática.
+        # No modo de retângulos sujos só as áreas do frame anterior são restauradas.
+        view = renderer.begin(screen, sprite_groups)
 
         # 13) DESENHA INIMIGOS, TORRES E PROJÉTEIS
-        enemies.draw(screen)
-        towers.draw(screen)
-        bullets.draw(screen)
-
+        renderer.draw_sprites(screen, sprite_groups)
 
         # 14) HUD: ÍCONES DE DINHEIRO E VIDA + TEXTO
-        hud_x = max(int(10 * SCALE), 1)
-        hud_y = max(int(10 * SCALE), 1)
-        screen.blit(icon_money, (hud_x, hud_y))
-        fonte.render_to(
-            screen,
-            (hud_x + size_icon + max(int(5 * SCALE), 1), hud_y + max(int(2 * SCALE), 1)),
-            f"x {game_state.money}",
-            (240, 240, 240)
-        )
-
-        hud_y2 = hud_y + size_icon + max(int(4 * SCALE), 1)
-        screen.blit(icon_life, (hud_x, hud_y2))
-        fonte.render_to(
-            screen,
-            (hud_x + size_icon + max(int(5 * SCALE), 1), hud_y2 + max(int(2 * SCALE), 1)),
-            f"x {game_state.lives}",
-            (240, 240, 240)
-        )
+        hud_x = max(int(10 * scale), 1)
+        hud_y = max(int(10 * scale), 1)
+        if hud_values != (game_state.money, game_state.lives):
+            hud_values = (game_state.money, game_state.lives)
+            hud_money_surf = text_cache.render(fonte, f"x {game_state.money}", (240, 240, 240))
+            hud_lives_surf = text_cache.render(fonte, f"x {game_state.lives}", (240, 240, 240))
+
+        renderer.mark(view.blit(icon_money, (hud_x, hud_y)))
+        renderer.mark(view.blit(
+            hud_money_surf,
+            (hud_x + size_icon + max(int(5 * scale), 1), hud_y + max(int(2 * scale), 1))
+        ))
+
+        hud_y2 = hud_y + size_icon + max(int(4 * scale), 1)
+        renderer.mark(view.blit(icon_life, (hud_x, hud_y2)))
+        renderer.mark(view.blit(
+            hud_lives_surf,
+            (hud_x + size_icon + max(int(5 * scale), 1), hud_y2 + max(int(2 * scale), 1))
+        ))
+
+        # 14.1) INDICADOR DE ACELERAÇÃO (só quando diferente de 1×)
+        if stepper.speed != 1:
+            speed_label = "Sem limite" if stepper.uncapped else f"{stepper.speed}×"
+            renderer.mark(text_cache.blit(
+                view,
+                fonte,
+                (hud_x, hud_y2 + size_icon + max(int(6 * scale), 1)),
+                f">> {speed_label}",
+                (240, 240, 240)
+            ))
+
+        # 14.2) POLÍTICA DE MIRA DA TORRE SOB O MOUSE (tecla T troca)
+        mx, my = mouse_pos()
+        torre = sim.tower_at((mx / scale_x, my / scale_y))
+        if torre is not None:
+            renderer.mark(text_cache.blit(
+                view,
+                fonte,
+                (torre.rect.left, torre.rect.bottom + max(int(2 * scale), 1)),
+                f"mira: {torre.policy}",
+                (240, 240, 240)
+            ))
 
         # 15) BOTÃO “PRÓXIMA FASE” (se for para exibir)
         if show_next_button and (current_level < max_level_index):
-            pygame.draw.rect(screen, button_color, button_rect, border_radius=max(int(4 * SCALE), 1))
-            fonte.render_to(
-                screen,
-                (button_rect.x + max(int(12 * SCALE), 1), button_rect.y + max(int(5 * SCALE), 1)),
+            renderer.mark(pygame.draw.rect(view, button_color, button_rect, border_radius=max(int(4 * scale), 1)))
+            text_cache.blit(
+                view,
+                fonte,
+                (button_rect.x + max(int(12 * scale), 1), button_rect.y + max(int(5 * scale), 1)),
                 "Próxima Fase",
                 button_text_color
             )
 
+        # 15.1) INDICADOR DE CARREGAMENTO (próximo nível ainda na thread)
+        if loading_level is not None:
+            loading_surf = text_cache.render(fonte, f"Carregando nível {loading_level + 1}...", LOADING_TEXT_COLOR)
+            renderer.mark(view.blit(
+                loading_surf,
+                (button_rect.right - loading_surf.get_width(), button_rect.y + max(int(5 * scale), 1))
+            ))
+
         # 16) MENU DE SELEÇÃO DE TORRE (POPUP)
         if show_tower_menu:
-            # 16.1) Mede dimensões do texto para criar o balão
-            max_text_width = 0
-            text_height = 0
-            rendered_texts = []
-            for name, cost in menu_lines:
-                txt = f"{name} (${cost})"
-                surf, _ = fonte.render(txt, (255, 255, 255))
-                rendered_texts.append(surf)
-                max_text_width = max(max_text_width, surf.get_width())
-                text_height = max(text_height, surf.get_height())
-
-            menu_width = max_text_width + 2 * menu_padding_x
-            menu_height = len(menu_lines) * text_height + 2 * menu_padding_y + (len(menu_lines) - 1) * line_spacing
-
-            real_menu_x = int(click_x_base * SCALE_X) + max(int(10 * SCALE), 1)
-            real_menu_y = int(click_y_base * SCALE_Y)
-
-            # 16.2) Desenha retângulo semi-transparente atrás do balão
-            overlay = pygame.Surface((menu_width, menu_height), pygame.SRCALPHA)
-            overlay.fill((0, 0, 0, 180))
-            screen.blit(overlay, (real_menu_x, real_menu_y))
-
-            # 16.3) Desenha cada linha de texto centralizada
+            # 16.1) Dimensões do balão (pré-calculadas em menu_layout)
+            menu_width = menu_layout["width"]
+
+            real_menu_x = int(click_x_base * scale_x) + max(int(10 * scale), 1)
+            real_menu_y = int(click_y_base * scale_y)
+
+            # 16.2) PRÉVIA DE COBERTURA: range da torre da linha sob o mouse
+            # (ou da selecionada com 1/2) e os trechos do caminho ao alcance —
+            # os mesmos intervalos que a torre usará para mirar
+            mx, my = mouse_pos()
+            hovered_line = (my - real_menu_y - menu_padding_y) // menu_layout["line_h"]
+            preview_class = selected_tower_type
+            if real_menu_x <= mx < real_menu_x + menu_width and 0 <= hovered_line < len(menu_lines):
+                preview_class = BasicTower if menu_lines[hovered_line][0] == "Basic Tower" else SniperTower
+            path_table = paths.get_path_table(current_level)
+            preview = path_table.coverage(click_x_base, click_y_base, preview_class.BASE_RANGE)
+
+            center = (int(click_x_base * scale_x), int(click_y_base * scale_y))
+            renderer.mark(pygame.draw.circle(view, COVERAGE_PREVIEW_COLOR, center,
+                                             max(int(preview_class.BASE_RANGE * scale), 1), 1))
+            for d0, d1 in preview:
+                points = [(int(x * scale_x), int(y * scale_y)) for x, y in path_table.points_between(d0, d1)]
+                renderer.mark(pygame.draw.lines(view, COVERAGE_PREVIEW_COLOR, False, points,
+                                                max(int(12 * scale), 1)))
+            covered = sum(d1 - d0 for d0, d1 in preview)
+            renderer.mark(text_cache.blit(
+                view,
+                fonte,
+                (real_menu_x, real_menu_y + menu_layout["height"] + max(int(4 * scale), 1)),
+                f"cobre {covered:.0f} px do caminho",
+                COVERAGE_PREVIEW_COLOR
+            ))
+
+            # 16.3) Desenha retângulo semi-transparente atrás do balão
+            renderer.mark(view.blit(menu_layout["overlay"], (real_menu_x, real_menu_y)))
+
+            # 16.4) Desenha cada linha de texto centralizada
             y_offset = real_menu_y + menu_padding_y
-            for text_surf in rendered_texts:
+            for text_surf in menu_layout["texts"]:
                 x_offset = real_menu_x + (menu_width - text_surf.get_width()) // 2
-                screen.blit(text_surf, (x_offset, y_offset))
-                y_offset += text_height + line_spacing
-
-        pygame.display.flip()
+                view.blit(text_surf, (x_offset, y_offset))
+                y_offset += menu_layout["line_h"]
+
+        # 17) OVERLAY DO PROFILER (abaixo do HUD)
+        for rect in profiler.draw(view, fonte, text_cache,
+                                  (hud_x, hud_y2 + size_icon + max(int(36 * scale), 1))):
+            renderer.mark(rect)
+        profiler.lap("draw")
+
+        renderer.present()
+        profiler.lap("present")
+        if startup is not None:
+            startup.lap("1º loop")
+            if STARTUP_REPORT:
+                print("\n".join(startup_lines(startup.totals)), file=sys.stderr)
+            startup = None
+        profiler.end_frame(enemies=len(sim.enemies), towers=len(sim.towers), bullets=len(sim.bullets),
+                           bullet_peak=sim.ctx.bullet_pool.high_water)
 
     # Quando sair do loop principal:
+    if recorder is not None:
+        recorder.finish(os.path.join(REPLAY_DIR, time.strftime("sessao-%Y%m%d-%H%M%S.json")))
+    profiler.close()
+    assets.close()
     pygame.quit()
     sys.exit()
 
@@ -0,0 +1,160 @@
+# occupancy.py
+
+import math
+
+import paths
+from config import BASE_WIDTH, BASE_HEIGHT, OCCUPANCY_CELL_SIZE, PATH_THICKNESS, TOWER_BASE_SIZE
+
+# Conteúdo de cada célula da grade
+FREE, PATH, TOWER = 0, 1, 2
+
+
+class OccupancyGrid:
+    """
+    Grade de ocupação de um nível em coordenadas base (1536×1024), com
+    células de OCCUPANCY_CELL_SIZE px. Cada célula é FREE, PATH (o caminho
+    rasterizado na espessura em que é desenhado, PATH_THICKNESS) ou TOWER
+    (a área de uma torre, TOWER_BASE_SIZE × TOWER_BASE_SIZE).
+
+    Além do conteúdo, a grade mantém `legal`: 1 nas células onde o centro de
+    uma nova torre pode ficar (a área inteira dela dentro da tela, fora do
+    caminho e fora de outras torres). Validar um clique e achar a torre sob
+    o mouse viram uma consulta O(1); `legal_spots()` enumera os pontos livres
+    para buscas de posicionamento (balance.py, IA).
+    """
+
+    def __init__(self, level_index, cell_size=OCCUPANCY_CELL_SIZE):
+        self.level_index = level_index
+        self.cell_size = cell_size
+        self.cols = math.ceil(BASE_WIDTH / cell_size)
+        self.rows = math.ceil(BASE_HEIGHT / cell_size)
+        # Meia área de uma torre, em células (arredondada para cima)
+        self.reach = math.ceil(TOWER_BASE_SIZE / 2 / cell_size)
+
+        cells, legal = _level_layers(level_index, cell_size)
+        self.cells = bytearray(cells)
+        self.legal = bytearray(legal)
+        self.owner = [None] * (self.cols * self.rows)   # célula -> torre que a ocupa (ou None)
+
+    def cell_of(self, x, y):
+        """Índice da célula de (x, y) base, ou -1 fora da tela."""
+        col = int(x // self.cell_size)
+        row = int(y // self.cell_size)
+        if 0 <= col < self.cols and 0 <= row < self.rows:
+            return row * self.cols + col
+        return -1
+
+    def can_place(self, x, y):
+        """True se uma torre centrada em (x, y) base cabe ali."""
+        i = self.cell_of(x, y)
+        return i >= 0 and self.legal[i] == 1
+
+    def is_path(self, x, y):
+        i = self.cell_of(x, y)
+        return i >= 0 and self.cells[i] == PATH
+
+    def tower_at(self, x, y):
+        """Torre cuja área contém (x, y) base, ou None."""
+        i = self.cell_of(x, y)
+        return self.owner[i] if i >= 0 else None
+
+    def add_tower(self, tower):
+        """Marca a área de `tower` (centrada em tower.pos_base) como ocupada."""
+        cols, rows, k = self.cols, self.rows, self.reach
+        col = int(tower.pos_base[0] // self.cell_size)
+        row = int(tower.pos_base[1] // self.cell_size)
+        c0, c1 = max(col - k, 0), min(col + k + 1, cols)
+        if c1 > c0:
+            # Uma fatia por linha da área da torre
+            area = bytes([TOWER]) * (c1 - c0)
+            owners = [tower] * (c1 - c0)
+            for r in range(max(row - k, 0), min(row + k + 1, rows)):
+                start = r * cols
+                self.cells[start + c0:start + c1] = area
+                self.owner[start + c0:start + c1] = owners
+        # Qualquer centro a até 2·reach células agora sobreporia esta torre
+        lo, hi = max(col - 2 * k, 0), min(col + 2 * k + 1, cols)
+        if hi <= lo:
+            return   # torre fora da tela (cenários sintéticos): nada a bloquear
+        for r in range(max(row - 2 * k, 0), min(row + 2 * k + 1, rows)):
+            start = r * cols
+            self.legal[start + lo:start + hi] = bytes(hi - lo)
+
+    def legal_spots(self, step=1):
+        """
+        Centros (x, y) base das células onde cabe uma torre, varrendo a
+        grade de `step` em `step` células.
+        """
+        cs, cols = self.cell_size, self.cols
+        half = cs // 2
+        legal = self.legal
+        return [(c * cs + half, r * cs + half)
+                for r in range(0, self.rows, step)
+                for c in range(0, cols, step)
+                if legal[r * cols + c]]
+
+
+# Conversões célula <-> dígito binário usadas em _level_layers()
+_TO_BITS = bytes([ord("0")] + [ord("1")] * 255)          # FREE -> "0", resto -> "1"
+_FROM_BITS = bytes(ord("1") == i for i in range(256))    # "1" -> 1, resto -> 0
+
+# Cache: (level_index, cell_size) -> (waypoints, cells, legal) só com o caminho
+_level_grids = {}
+
+def _level_layers(level_index, cell_size):
+    """
+    Camadas `cells`/`legal` de um nível ainda sem torres: o caminho é
+    rasterizado uma vez por nível e cada partida copia o resultado.
+    """
+    waypoints = tuple(tuple(p) for p in paths.PATHS[level_index]) if level_index < len(paths.PATHS) else ()
+    key = (level_index, cell_size)
+    cached = _level_grids.get(key)
+    if cached is not None and cached[0] == waypoints:
+        return cached[1], cached[2]
+
+    cols = math.ceil(BASE_WIDTH / cell_size)
+    rows = math.ceil(BASE_HEIGHT / cell_size)
+    cells = bytearray(cols * rows)
+
+    # Caminho: células cujo centro fica a até (meia espessura + meia célula)
+    # de algum segmento — a faixa desenhada por paths.draw_path()
+    reach = PATH_THICKNESS / 2 + cell_size / 2
+    for (ax, ay), (bx, by) in zip(waypoints, waypoints[1:]):
+        vx, vy = bx - ax, by - ay
+        length2 = vx * vx + vy * vy
+        c0 = max(int((min(ax, bx) - reach) // cell_size), 0)
+        c1 = min(int((max(ax, bx) + reach) // cell_size), cols - 1)
+        r0 = max(int((min(ay, by) - reach) // cell_size), 0)
+        r1 = min(int((max(ay, by) + reach) // cell_size), rows - 1)
+        for r in range(r0, r1 + 1):
+            py = r * cell_size + cell_size / 2
+            for c in range(c0, c1 + 1):
+                px = c * cell_size + cell_size / 2
+                t = 0.0 if length2 == 0 else max(0.0, min(1.0, ((px - ax) * vx + (py - ay) * vy) / length2))
+                dx, dy = ax + vx * t - px, ay + vy * t - py
+                if dx * dx + dy * dy <= reach * reach:
+                    cells[r * cols + c] = PATH
+
+    # legal: a janela (2·k+1)² ao redor da célula está toda livre e dentro
+    # da grade. Cada linha vira um inteiro (bit c = célula c ocupada) e a
+    # janela é uma dilatação por deslocamentos de bits: ~(2·k+1) operações
+    # por linha em vez de um laço Python por célula (roda na abertura do jogo)
+    k = math.ceil(TOWER_BASE_SIZE / 2 / cell_size)
+    dilated = []
+    for r in range(rows):
+        row = int(cells[r * cols:(r + 1) * cols].translate(_TO_BITS)[::-1], 2)
+        wide = row
+        for shift in range(1, k + 1):
+            wide |= (row << shift) | (row >> shift)
+        dilated.append(wide)
+    inner = ((1 << (cols - 2 * k)) - 1) << k   # colunas k .. cols-k-1
+    legal = bytearray(cols * rows)
+    for r in range(k, rows - k):
+        blocked = 0
+        for wide in dilated[r - k:r + k + 1]:
+            blocked |= wide
+        bits = format(~blocked & inner, f"0{cols}b")
+        legal[r * cols:(r + 1) * cols] = bits[::-1].encode().translate(_FROM_BITS)
+
+    _level_grids[key] = (waypoints, bytes(cells), bytes(legal))
+    return cells, legal
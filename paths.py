@@ -1,7 +1,9 @@
 # paths.py
 
+import math
 import pygame
-from config import PATH_COLOR, SCALE_X, SCALE_Y
+from bisect import bisect_right
+from config import BASE_WIDTH, BASE_HEIGHT, PATH_COLOR, PATH_THICKNESS
 
 # Cada lista em PATHS[] é a sequência de waypoints (x, y) na base 1536×1024
 PATHS = [
@@ -18,31 +20,52 @@ PATHS = [
     ],
 
     # ===== Level 2 =====
-    # [
-    #     (-50, 500),
-    #     (300, 500),
-    #     (300, 300),
-    #     (900, 300),
-    #     (900, 700),
-    #     (1586, 700)
-    # ],
+    # Segue a estrada desenhada em L2.png: entra pela ponta de baixo, à
+    # esquerda, e sai pela ponta de baixo, à direita
+    [
+        (555,  890),   # 1) Ponta inferior esquerda da estrada
+        (600,  820),
+        (610,  760),
+        (565,  700),
+        (490,  650),
+        (455,  580),
+        (460,  500),   # 2) Curva à esquerda
+        (520,  455),
+        (600,  445),
+        (700,  460),
+        (800,  460),   # 3) Trecho reto no meio do mapa
+        (865,  420),
+        (895,  330),
+        (930,  255),
+        (1000, 225),   # 4) Topo da curva
+        (1100, 230),
+        (1185, 260),
+        (1225, 330),
+        (1225, 420),
+        (1190, 500),
+        (1170, 600),
+        (1190, 690),
+        (1250, 765),   # 5) Saída: ponta inferior direita da estrada
+    ],
 ]
 
 def draw_path(level_index: int, surface: pygame.Surface):
     """
     Desenha o “path” ligando cada waypoint de PATHS[level_index].
-    Converte coordenadas base (1536×1024) → coordenadas de tela (via SCALE_X e SCALE_Y).
+    Converte coordenadas base (1536×1024) → coordenadas da `surface`, com a
+    escala dada pelo tamanho dela (a janela, ou o canvas base no modo "canvas").
     """
     if level_index < 0 or level_index >= len(PATHS):
         return
 
     path = PATHS[level_index]
-    from config import SCALE
-    thickness = max(int(40 * SCALE), 1)  # espessura base = 40 px, escalonada
+    scale_x = surface.get_width() / BASE_WIDTH
+    scale_y = surface.get_height() / BASE_HEIGHT
+    thickness = max(int(PATH_THICKNESS * min(scale_x, scale_y)), 1)  # espessura base, escalonada
 
     # Converte (x_base, y_base) → (x_tela, y_tela)
     scaled_points = [
-        (int(x * SCALE_X), int(y * SCALE_Y))
+        (int(x * scale_x), int(y * scale_y))
         for (x, y) in path
     ]
 
@@ -50,3 +73,152 @@ def draw_path(level_index: int, surface: pygame.Surface):
         p1 = scaled_points[i]
         p2 = scaled_points[i + 1]
         pygame.draw.line(surface, PATH_COLOR, p1, p2, thickness)
+
+
+class PathTable:
+    """
+    Caminho “compilado” por comprimento de arco.
+    cum[i] é a distância percorrida (px base) ao chegar no waypoint i e
+    dirs[i] o vetor unitário do segmento i → i+1. Com isso a posição de
+    um inimigo é função de um único float (distância percorrida).
+    """
+
+    def __init__(self, waypoints):
+        self.points = [(float(x), float(y)) for (x, y) in waypoints]
+        self.cum = [0.0]
+        self.dirs = []
+        for (x1, y1), (x2, y2) in zip(self.points, self.points[1:]):
+            seg_len = math.hypot(x2 - x1, y2 - y1)
+            if seg_len > 0:
+                self.dirs.append(((x2 - x1) / seg_len, (y2 - y1) / seg_len))
+            else:
+                self.dirs.append((0.0, 0.0))
+            self.cum.append(self.cum[-1] + seg_len)
+        self.length = self.cum[-1]
+        self.num_segments = len(self.dirs)
+
+    def segment_at(self, distance):
+        """Índice do segmento que contém `distance` (busca binária em cum)."""
+        seg = bisect_right(self.cum, distance) - 1
+        return min(max(seg, 0), max(self.num_segments - 1, 0))
+
+    def advance_segment(self, distance, seg):
+        """
+        Igual a segment_at(), mas partindo de um índice já conhecido:
+        como a distância só cresce, o custo amortizado é O(1).
+        """
+        last = self.num_segments - 1
+        cum = self.cum
+        while seg < last and distance >= cum[seg + 1]:
+            seg += 1
+        return seg
+
+    def position(self, distance, seg=None):
+        """(x, y) em coordenadas base a `distance` px do início do caminho."""
+        if seg is None:
+            seg = self.segment_at(distance)
+        if self.num_segments == 0:
+            return self.points[0]
+        x0, y0 = self.points[seg]
+        ux, uy = self.dirs[seg]
+        t = distance - self.cum[seg]
+        return (x0 + ux * t, y0 + uy * t)
+
+    def coverage(self, x, y, radius):
+        """
+        Trechos do caminho a até `radius` de (x, y), como intervalos de
+        distância percorrida [(d0, d1), …] ordenados e sem sobreposição.
+        Um inimigo está dentro do círculo exatamente quando sua `distance`
+        cai num desses intervalos.
+        """
+        r2 = radius * radius
+        intervals = []
+        for seg in range(self.num_segments):
+            x0, y0 = self.points[seg]
+            ux, uy = self.dirs[seg]
+            seg_len = self.cum[seg + 1] - self.cum[seg]
+            # Projeção do centro na reta do segmento e distância perpendicular²
+            t = (x - x0) * ux + (y - y0) * uy
+            px, py = x0 + ux * t - x, y0 + uy * t - y
+            h2 = r2 - (px * px + py * py)
+            if h2 < 0:
+                continue
+            half = math.sqrt(h2)
+            lo, hi = max(t - half, 0.0), min(t + half, seg_len)
+            if lo > hi:
+                continue
+            lo += self.cum[seg]
+            hi += self.cum[seg]
+            # Segmentos consecutivos: junta os trechos que se encostam na quina
+            if intervals and lo <= intervals[-1][1] + 1e-9:
+                intervals[-1] = (intervals[-1][0], max(intervals[-1][1], hi))
+            else:
+                intervals.append((lo, hi))
+        return intervals
+
+    def points_between(self, d0, d1):
+        """Polilinha (pontos base) do caminho entre as distâncias d0 e d1."""
+        seg0 = self.segment_at(d0)
+        seg1 = self.segment_at(d1)
+        points = [self.position(d0, seg0)]
+        points.extend(self.points[seg0 + 1:seg1 + 1])
+        points.append(self.position(d1, seg1))
+        return points
+
+    def intercept(self, distance, speed, ox, oy, projectile_speed):
+        """
+        Tempo (s) até um projétil disparado de (ox, oy) a `projectile_speed`
+        px/s alcançar um inimigo que está em `distance` e anda a `speed` px/s.
+        Resolve, segmento a segmento, |posição(distance + speed·t) − origem|
+        = projectile_speed·t e devolve a menor raiz válida; None se o inimigo
+        chega ao fim do caminho antes do impacto.
+        """
+        if distance >= self.length or self.num_segments == 0:
+            return None
+        s2 = projectile_speed * projectile_speed
+        t_start = 0.0
+        for seg in range(self.segment_at(distance), self.num_segments):
+            if speed > 0:
+                t_end = (self.cum[seg + 1] - distance) / speed
+            else:
+                t_end = math.inf
+            x0, y0 = self.points[seg]
+            ux, uy = self.dirs[seg]
+            # Posição relativa à origem em t=0 (extrapolada no segmento) e velocidade
+            qx = x0 + ux * (distance - self.cum[seg]) - ox
+            qy = y0 + uy * (distance - self.cum[seg]) - oy
+            wx, wy = ux * speed, uy * speed
+            a = wx * wx + wy * wy - s2
+            b = 2 * (qx * wx + qy * wy)
+            c = qx * qx + qy * qy
+            if abs(a) < 1e-9:
+                roots = (-c / b,) if b != 0 else ()
+            else:
+                disc = b * b - 4 * a * c
+                if disc < 0:
+                    roots = ()
+                else:
+                    r = math.sqrt(disc)
+                    roots = sorted(((-b - r) / (2 * a), (-b + r) / (2 * a)))
+            for t in roots:
+                if t_start <= t <= t_end:
+                    return t
+            t_start = t_end
+        return None
+
+
+# Cache: level_index -> (waypoints usados na compilação, PathTable)
+_path_tables = {}
+
+def get_path_table(level_index: int) -> PathTable:
+    """
+    PathTable de PATHS[level_index], compilada uma vez por nível e
+    recompilada só se os waypoints desse nível mudarem.
+    """
+    waypoints = tuple(tuple(p) for p in PATHS[level_index])
+    cached = _path_tables.get(level_index)
+    if cached is not None and cached[0] == waypoints:
+        return cached[1]
+    table = PathTable(waypoints)
+    _path_tables[level_index] = (waypoints, table)
+    return table
@@ -0,0 +1,181 @@
+# profiler.py
+
+import json
+import time
+from collections import deque
+from config import PROFILER_ENABLED, PROFILER_WINDOW, PROFILER_LOG_FILE
+
+
+class PhaseTimer:
+    """
+    Cronômetro por fase de um tick/frame. Uso:
+
+        timer.start()
+        ...                    # fase A
+        timer.lap("enemies")
+        ...                    # fase B
+        timer.lap("bullets")
+
+    Cada lap() soma o tempo desde a marca anterior em `totals[nome]` (s) e
+    guarda a amostra do tick atual em `current[nome]`. Quem não quer medir
+    simplesmente não instala um timer (Simulation.phase_timer = None).
+    """
+
+    def __init__(self, clock=time.perf_counter):
+        self.clock = clock
+        self.totals = {}
+        self.current = {}
+        self._mark = 0.0
+
+    def start(self, at=None):
+        """Começa a medir agora (ou a partir do instante `at` do mesmo relógio)."""
+        self._mark = self.clock() if at is None else at
+
+    def lap(self, name):
+        now = self.clock()
+        elapsed = now - self._mark
+        self._mark = now
+        self.current[name] = self.current.get(name, 0.0) + elapsed
+        self.totals[name] = self.totals.get(name, 0.0) + elapsed
+
+    def take(self):
+        """Retorna e zera as amostras acumuladas desde a última chamada."""
+        sample = self.current
+        self.current = {}
+        return sample
+
+
+def startup_lines(totals):
+    """Relatório da abertura: cada etapa (ms e % do total) e o total até o 1º frame."""
+    total = sum(totals.values())
+    lines = [f"{name:<12} {seconds * 1000:7.1f} ms  {seconds / total:5.1%}"
+             for name, seconds in totals.items()]
+    lines.append(f"{'total':<12} {total * 1000:7.1f} ms")
+    return lines
+
+
+class FrameProfiler:
+    """
+    Instrumentação do loop principal: tempo por fase de cada frame,
+    janelas móveis com percentis (p50/p95/p99), contagem de entidades,
+    overlay opcional na tela e gravação das amostras em arquivo (JSON lines).
+
+    Desligado (enabled=False), cada chamada retorna na primeira linha e a
+    Simulation fica sem PhaseTimer: o custo é praticamente zero.
+    """
+
+    def __init__(self, enabled=PROFILER_ENABLED, window=PROFILER_WINDOW, log_path=PROFILER_LOG_FILE):
+        self.timer = PhaseTimer()
+        self.window = window
+        self.frame_times = deque(maxlen=window)   # ms por frame
+        self.phase_times = {}                     # fase -> deque de ms
+        self.counts = {}
+        self.frame = 0
+        self.enabled = False
+        self._sim = None
+        self._log = open(log_path, "w", encoding="utf-8") if log_path else None
+        self._start = 0.0
+        self._lines = []
+        if enabled:
+            self.enable()
+
+    def attach(self, sim):
+        """Associa a Simulation cujas fases internas também serão medidas."""
+        self._sim = sim
+        sim.phase_timer = self.timer if self.enabled else None
+
+    def enable(self):
+        self.enabled = True
+        if self._sim is not None:
+            self._sim.phase_timer = self.timer
+
+    def disable(self):
+        self.enabled = False
+        if self._sim is not None:
+            self._sim.phase_timer = None
+
+    def toggle(self):
+        if self.enabled:
+            self.disable()
+        else:
+            self.enable()
+
+    # ===============================
+    # MARCAÇÃO DAS FASES
+    # ===============================
+    def begin_frame(self):
+        if not self.enabled:
+            return
+        self.timer.take()
+        self._start = self.timer.clock()
+        self.timer.start()
+
+    def lap(self, name):
+        if not self.enabled:
+            return
+        self.timer.lap(name)
+
+    def end_frame(self, **counts):
+        """Fecha o frame: guarda as amostras (ms) e as contagens de entidades."""
+        if not self.enabled:
+            return
+        total_ms = (self.timer.clock() - self._start) * 1000
+        sample = {name: sec * 1000 for name, sec in self.timer.take().items()}
+        self.frame += 1
+        self.frame_times.append(total_ms)
+        for name, ms in sample.items():
+            hist = self.phase_times.get(name)
+            if hist is None:
+                hist = self.phase_times[name] = deque(maxlen=self.window)
+            hist.append(ms)
+        self.counts = counts
+
+        if self._log is not None:
+            record = {"frame": self.frame, "total_ms": round(total_ms, 4)}
+            record.update({name: round(ms, 4) for name, ms in sample.items()})
+            record["counts"] = counts
+            self._log.write(json.dumps(record) + "\n")
+
+    # ===============================
+    # ESTATÍSTICAS
+    # ===============================
+    @staticmethod
+    def percentiles(values, points=(50, 95, 99)):
+        if not values:
+            return {p: 0.0 for p in points}
+        ordered = sorted(values)
+        last = len(ordered) - 1
+        return {p: ordered[min(last, int(round(p / 100 * last)))] for p in points}
+
+    def summary_lines(self):
+        """Linhas de texto do overlay."""
+        pct = self.percentiles(self.frame_times)
+        lines = [f"frame p50 {pct[50]:.2f}  p95 {pct[95]:.2f}  p99 {pct[99]:.2f} ms"]
+        for name, hist in self.phase_times.items():
+            p = self.percentiles(hist)
+            lines.append(f"{name:<10} p50 {p[50]:.2f}  p99 {p[99]:.2f} ms")
+        if self.counts:
+            lines.append("  ".join(f"{k} {v}" for k, v in self.counts.items()))
+        return lines
+
+    def draw(self, surface, font, text_cache, pos):
+        """
+        Desenha o overlay em `pos`; retorna a lista de rects desenhados.
+        O texto é recalculado a cada 15 frames (legível e sem encher o cache).
+        """
+        if not self.enabled:
+            return []
+        if not self._lines or self.frame % 15 == 0:
+            self._lines = self.summary_lines()
+        x, y = pos
+        rects = []
+        for line in self._lines:
+            rect = text_cache.blit(surface, font, (x, y), line, (255, 255, 120))
+            rects.append(rect)
+            y += rect.height + 2
+        return rects
+
+    def close(self):
+        if self._log is not None:
+            self._log.close()
+            self._log = None
@@ -0,0 +1,134 @@
+# renderer.py
+
+import pygame
+import paths
+from config import BG_COLOR, DRAW_PATH, DIRTY_RECT_RENDERING, CANVAS_SMOOTH_SCALE
+
+
+class Renderer:
+    """
+    Desenho por retângulos sujos sobre uma camada estática pré-composta.
+
+    O fundo do nível e o “path” são compostos UMA vez numa Surface do
+    tamanho da janela (rebuild_static), refeita só em troca de nível ou
+    VIDEORESIZE. A cada frame apenas as áreas que mudaram (sprites que se
+    moveram/sumiram e o HUD) são restauradas, redesenhadas e enviadas com
+    pygame.display.update(rects).
+
+    Com dirty=False (ou DIRTY_RECT_RENDERING = False) volta ao modo antigo:
+    redesenha a tela inteira e chama display.flip().
+
+    Com `canvas_size` (modo "canvas" do config.RENDER_MODE) tudo é desenhado
+    numa superfície fixa desse tamanho (a base 1536×1024), independente da
+    janela; present() a escala para a janela uma única vez por frame. Se a
+    janela tiver o tamanho do canvas, só as áreas sujas são copiadas.
+
+    Uso por frame:
+        view = renderer.begin(screen, groups)   # canvas ou a própria tela
+        renderer.draw_sprites(screen, groups)
+        renderer.mark(view.blit(...))   # HUD, menus, botões…
+        renderer.present()
+    """
+
+    def __init__(self, dirty=DIRTY_RECT_RENDERING, canvas_size=None):
+        self.dirty = dirty
+        self.canvas_size = canvas_size
+        self.canvas = None        # criado no primeiro uso (convert() exige a janela)
+        self._presented = None    # tamanho da janela no último present() do canvas
+        self.static = None
+        self._full_redraw = True
+        self._rects = []          # áreas alteradas neste frame
+        self._overlay_rects = []  # HUD/menus desenhados neste frame
+        self._last_overlays = []  # HUD/menus do frame anterior (a limpar)
+
+    def target(self, screen):
+        """Superfície onde o frame é desenhado: o canvas fixo ou a própria tela."""
+        if self.canvas_size is None:
+            return screen
+        if self.canvas is None:
+            self.canvas = pygame.Surface(self.canvas_size).convert()
+        return self.canvas
+
+    def rebuild_static(self, screen, background, level_index):
+        """
+        Compõe a camada estática: fundo (já no tamanho de target()) + path.
+        background: Surface do nível ou None (usa BG_COLOR).
+        """
+        static = pygame.Surface(self.target(screen).get_size()).convert()
+        if background is not None:
+            static.blit(background, (0, 0))
+        else:
+            static.fill(BG_COLOR)
+        if DRAW_PATH and (level_index < len(paths.PATHS)):
+            paths.draw_path(level_index, static)
+        self.static = static
+        self.invalidate()
+
+    def invalidate(self):
+        """Força um redesenho completo no próximo frame."""
+        self._full_redraw = True
+
+    def begin(self, screen, groups):
+        """
+        Apaga o frame anterior: a tela toda ou só as áreas sujas.
+        Retorna a superfície de desenho do frame (target()).
+        """
+        view = self.target(screen)
+        self._rects = []
+        self._overlay_rects = []
+        if not self.dirty or self._full_redraw:
+            view.blit(self.static, (0, 0))
+            return view
+
+        for group in groups:
+            group.clear(view, self.static)
+        for rect in self._last_overlays:
+            view.blit(self.static, rect, rect)
+        self._rects.extend(self._last_overlays)
+        return view
+
+    def draw_sprites(self, screen, groups):
+        view = self.target(screen)
+        for group in groups:
+            self._rects.extend(group.draw(view))
+
+    def mark(self, rect):
+        """Registra uma área desenhada por cima dos sprites (HUD, menus…)."""
+        self._overlay_rects.append(pygame.Rect(rect))
+        return rect
+
+    def present(self):
+        """Envia o frame: display.update(áreas sujas) ou flip() no redesenho completo."""
+        self._last_overlays = self._overlay_rects
+        full = not self.dirty or self._full_redraw
+        self._full_redraw = False
+        self._rects.extend(self._overlay_rects)
+        if self.canvas is not None:
+            self._present_canvas(full)
+        elif full:
+            pygame.display.flip()
+        else:
+            pygame.display.update(self._rects)
+
+    def _present_canvas(self, full):
+        """Leva o canvas para a janela: cópia das áreas sujas ou uma escala só."""
+        screen = pygame.display.get_surface()
+        size = screen.get_size()
+        if size != self._presented:
+            # A janela mudou de tamanho: a imagem anterior não vale mais
+            self._presented = size
+            full = True
+        if size == self.canvas.get_size():
+            if full:
+                screen.blit(self.canvas, (0, 0))
+                pygame.display.flip()
+            else:
+                for rect in self._rects:
+                    screen.blit(self.canvas, rect, rect)
+                pygame.display.update(self._rects)
+            return
+        if CANVAS_SMOOTH_SCALE:
+            pygame.transform.smoothscale(self.canvas, size, screen)
+        else:
+            pygame.transform.scale(self.canvas, size, screen)
+        pygame.display.flip()
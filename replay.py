@@ -0,0 +1,228 @@
+# replay.py
+#
+# Gravação e reprodução determinística de partidas.
+# O main.py grava a semente da Simulation e cada ação do jogador (compra de
+# torre, upgrade, troca de nível) marcada com o tick de simulação em que
+# aconteceu. Como toda a aleatoriedade sai de Simulation.rng e o tempo só
+# avança em ticks fixos, reaplicar as mesmas ações nos mesmos ticks leva
+# exatamente ao mesmo estado final — sem janela e na velocidade máxima.
+#
+# Uso (a partir da raiz do projeto):
+#     python replay.py replays/sessao-20250101-120000.json
+#
+# Sai com código 1 se o estado final divergir do gravado.
+
+import os
+import sys
+import json
+import time
+import base64
+import hashlib
+import argparse
+
+from towers import BasicTower, SniperTower
+from simulation import Simulation, TICK_MS
+
+REPLAY_VERSION = 1
+
+# Nome gravado no log → classe da torre
+TOWER_CLASSES = {cls.__name__: cls for cls in (BasicTower, SniperTower)}
+
+
+def state_digest(sim):
+    """
+    Resumo do estado da simulação: contadores legíveis e um hash de tudo
+    que a lógica usa (posições, HP, distâncias, cooldowns…). Dois estados
+    com o mesmo hash são, na prática, idênticos.
+    """
+    gs = sim.game_state
+    detail = (
+        sim.tick, sim.level_index, gs.money, gs.lives, sim.level_manager.current_wave,
+        [(type(t).__name__, tuple(t.pos_base), t.level, t.range, t.last_shot, t.policy) for t in sim.towers],
+        [(type(e).__name__, e.distance, e.hp, e.speed, e.wave) for e in sim.enemies],
+        [(tuple(b.pos_base), b.damage) for b in sim.bullets],
+    )
+    return {
+        "tick": sim.tick,
+        "level": sim.level_index,
+        "money": gs.money,
+        "lives": gs.lives,
+        "enemies": len(sim.enemies),
+        "towers": len(sim.towers),
+        "bullets": len(sim.bullets),
+        "hash": hashlib.sha256(repr(detail).encode()).hexdigest()[:16],
+    }
+
+
+class ReplayLog:
+    """
+    Log compacto de uma partida: semente, nível inicial e a lista de ações
+    [tipo, tick, args…]. Tipos:
+        ["place", tick, "BasicTower", x_base, y_base]
+        ["upgrade", tick, índice_da_torre]       (ordem de construção)
+        ["policy", tick, índice_da_torre, "first"]  (política de mira)
+        ["level", tick, índice_do_nível]
+        ["load", tick, snapshot_em_base64]      (carregamento de jogo salvo)
+    `end_tick` e `final` (state_digest) são preenchidos ao fim da gravação.
+    """
+
+    def __init__(self, seed, level_index=0, actions=None, end_tick=None, final=None):
+        self.seed = seed
+        self.level_index = level_index
+        self.actions = actions if actions is not None else []
+        self.end_tick = end_tick
+        self.final = final
+
+    def to_dict(self):
+        return {
+            "version": REPLAY_VERSION,
+            "seed": self.seed,
+            "level": self.level_index,
+            "end_tick": self.end_tick,
+            "final": self.final,
+            "actions": self.actions,
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        if data.get("version") != REPLAY_VERSION:
+            raise ValueError(f"versão de replay não suportada: {data.get('version')}")
+        return cls(data["seed"], data["level"], data["actions"], data["end_tick"], data["final"])
+
+    def save(self, path):
+        folder = os.path.dirname(path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, separators=(",", ":"))
+
+    @classmethod
+    def load(cls, path):
+        with open(path, encoding="utf-8") as f:
+            return cls.from_dict(json.load(f))
+
+
+class Recorder:
+    """
+    Grava as ações do jogador sobre uma Simulation. Cada método registra a
+    ação no tick atual e a aplica na simulação (assim gravação e jogo nunca
+    divergem).
+    """
+
+    def __init__(self, sim):
+        self.sim = sim
+        self.log = ReplayLog(sim.seed, sim.level_index)
+
+    def place_tower(self, tower_class, pos_base):
+        x, y = int(pos_base[0]), int(pos_base[1])
+        self.log.actions.append(["place", self.sim.tick, tower_class.__name__, x, y])
+        return self.sim.place_tower(tower_class, (x, y))
+
+    def upgrade_tower(self, tower):
+        index = self.sim.towers.sprites().index(tower)
+        self.log.actions.append(["upgrade", self.sim.tick, index])
+        self.sim.upgrade_tower(tower)
+
+    def set_target_policy(self, tower, policy):
+        index = self.sim.towers.sprites().index(tower)
+        self.log.actions.append(["policy", self.sim.tick, index, policy])
+        self.sim.set_target_policy(tower, policy)
+
+    def start_level(self, level_index):
+        self.log.actions.append(["level", self.sim.tick, level_index])
+        self.sim.start_level(level_index)
+
+    def load_snapshot(self, data):
+        """Carrega um jogo salvo (snapshot.dumps); o snapshot vai junto no log."""
+        import snapshot  # só quem carrega jogo salvo paga o import (abertura do main.py)
+        # Carrega antes de registrar: um snapshot recusado (SnapshotError) não entra no log
+        tick = self.sim.tick
+        snapshot.loads(data, self.sim)
+        self.log.actions.append(["load", tick, base64.b64encode(data).decode("ascii")])
+
+    def finish(self, path=None):
+        """Fecha o log com o tick e o estado final; grava em `path` se dado."""
+        self.log.end_tick = self.sim.tick
+        self.log.final = state_digest(self.sim)
+        if path:
+            self.log.save(path)
+        return self.log
+
+
+class ReplayPlayer:
+    """
+    Reproduz um ReplayLog numa Simulation nova com a mesma semente.
+    step() aplica as ações devidas no tick atual e avança um tick — a mesma
+    interface de Simulation.step(), o que permite usar um replay como
+    cenário de benchmark.
+    """
+
+    def __init__(self, log):
+        self.log = log
+        self.sim = Simulation(log.level_index, seed=log.seed)
+        self._next = 0
+
+    @property
+    def done(self):
+        # Um “load” pode voltar o relógio: só termina após a última ação
+        return self._next >= len(self.log.actions) and self.sim.tick >= self.log.end_tick
+
+    def apply_due(self):
+        """Aplica todas as ações gravadas para o tick atual."""
+        actions = self.log.actions
+        sim = self.sim
+        while self._next < len(actions) and actions[self._next][1] <= sim.tick:
+            kind, _, *args = actions[self._next]
+            self._next += 1
+            if kind == "place":
+                name, x, y = args
+                sim.place_tower(TOWER_CLASSES[name], (x, y))
+            elif kind == "upgrade":
+                sim.upgrade_tower(sim.towers.sprites()[args[0]])
+            elif kind == "policy":
+                sim.set_target_policy(sim.towers.sprites()[args[0]], args[1])
+            elif kind == "level":
+                sim.start_level(args[0])
+            elif kind == "load":
+                import snapshot
+                snapshot.loads(base64.b64decode(args[0]), sim)
+            else:
+                raise ValueError(f"ação desconhecida no replay: {kind}")
+
+    def step(self, dt=TICK_MS):
+        self.apply_due()
+        self.sim.step(dt)
+
+    def run(self):
+        """Roda até o tick final gravado; retorna o state_digest final."""
+        while True:
+            # Ações do último frame (antes de fechar a janela) também contam
+            self.apply_due()
+            if self.done:
+                return state_digest(self.sim)
+            self.sim.step()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Reproduz uma partida gravada sem janela.")
+    parser.add_argument("replay", help="arquivo gravado pelo main.py (RECORD_REPLAYS)")
+    args = parser.parse_args()
+
+    log = ReplayLog.load(args.replay)
+    player = ReplayPlayer(log)
+    start = time.perf_counter()
+    final = player.run()
+    elapsed = time.perf_counter() - start
+
+    print(f"{len(log.actions)} ações, {final['tick']} ticks em {elapsed:.2f}s "
+          f"({final['tick'] / max(elapsed, 1e-9):.0f} ticks/s)")
+    print("final: " + "  ".join(f"{k} {v}" for k, v in final.items()))
+    if log.final is not None and final != log.final:
+        print("DIVERGÊNCIA — gravado: " + "  ".join(f"{k} {v}" for k, v in log.final.items()))
+        return 1
+    print("estado final idêntico ao gravado")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,55 @@
+# scheduler.py
+
+import heapq
+
+
+class Scheduler:
+    """
+    Agenda de eventos em tempo de simulação (ms), sobre um heap.
+
+    Cada evento é um dado qualquer (ex.: ("spawn", 2)) marcado com o instante
+    em que vence. pop_due(now) entrega, em ordem de instante, todos os
+    eventos vencidos — inclusive os agendados durante a própria iteração,
+    se também já vencerem. Assim um passo grande (aceleração, ticks de
+    recuperação) não perde nem atrasa eventos.
+
+    Empates no instante saem na ordem de agendamento (contador `seq`), o que
+    mantém a simulação determinística.
+    """
+
+    def __init__(self):
+        self._heap = []
+        self.seq = 0
+
+    def __len__(self):
+        return len(self._heap)
+
+    def schedule(self, at, event):
+        """Agenda `event` para o instante `at` (ms de simulação)."""
+        heapq.heappush(self._heap, (at, self.seq, event))
+        self.seq += 1
+
+    @property
+    def next_time(self):
+        """Instante do próximo evento, ou None se a agenda estiver vazia."""
+        return self._heap[0][0] if self._heap else None
+
+    def pop_due(self, now):
+        """Gera (instante, evento) para cada evento com instante <= now."""
+        heap = self._heap
+        while heap and heap[0][0] <= now:
+            at, _, event = heapq.heappop(heap)
+            yield at, event
+
+    def clear(self):
+        self._heap.clear()
+
+    def entries(self):
+        """Eventos pendentes como (instante, seq, evento), em ordem de vencimento."""
+        return sorted(self._heap)
+
+    def restore(self, entries, seq):
+        """Recarrega a agenda a partir de entries() (usado pelo snapshot)."""
+        self._heap = list(entries)
+        heapq.heapify(self._heap)
+        self.seq = seq
@@ -0,0 +1,285 @@
+# simulation.py
+
+import time
+
+from config import (SIM_TICK_RATE, MAX_CATCHUP_STEPS, UNCAPPED_RENDER_INTERVAL, INITIAL_MONEY,
+                    BULLET_MODE, ENEMY_ENGINE)
+from context import GameContext
+from levels import LevelManager, LEVELS
+from spatial import ProgressIndex
+from occupancy import OccupancyGrid
+from towers import TARGET_POLICIES
+
+# Duração de um tick de simulação (ms)
+TICK_MS = 1000 / SIM_TICK_RATE
+
+
+class Simulation:
+    """
+    Núcleo de simulação sem janela e sem relógio real.
+    Possui um GameContext (inimigos, torres, projéteis, GameState, RNG e
+    escala) e o cronograma de ondas do nível atual; o tempo só avança via
+    step(dt). Toda aleatoriedade sai de self.rng (semente fixa → partida
+    reprodutível). Nada é global: várias Simulations convivem no mesmo
+    processo sem interferir umas nas outras.
+
+    O main.py é apenas um renderizador por cima desta classe.
+    """
+
+    def __init__(self, level_index=0, seed=None, scale=None, bullet_mode=BULLET_MODE,
+                 enemy_engine=ENEMY_ENGINE):
+        """
+        scale: (scale_x, scale_y) de tela do contexto; None = janela atual.
+        bullet_mode: "homing" ou "intercept" (ver config.BULLET_MODE).
+        enemy_engine: "sprites" ou "pool" (ver config.ENEMY_ENGINE).
+        """
+        self.seed = seed
+        self.ctx = GameContext(seed, level_index, scale, bullet_mode)
+        if enemy_engine == "pool":
+            from enemy_pool import EnemyEngine  # NumPy só é exigido neste modo
+            self.enemy_engine = EnemyEngine(self.ctx)
+            # O grupo do motor avisa cada spawn e cada morte ao pool
+            self.ctx.enemies = self.enemy_engine.group
+        elif enemy_engine == "sprites":
+            self.enemy_engine = None
+        else:
+            raise ValueError(f"motor de inimigos desconhecido: {enemy_engine}")
+        # Inimigos em ordem de progresso no caminho (atualizado 1× por tick,
+        # após enemies.update()): a mira de todas as políticas passa por ele
+        self.progress_index = ProgressIndex()
+
+        self.time_ms = 0.0
+        self.tick = 0
+        # Instrumentação opcional (profiler.PhaseTimer); None = sem custo
+        self.phase_timer = None
+        self.start_level(level_index)
+
+    # Atalhos para o contexto (mesmos objetos durante toda a partida)
+    @property
+    def rng(self):
+        return self.ctx.rng
+
+    @property
+    def game_state(self):
+        return self.ctx.state
+
+    @property
+    def enemies(self):
+        return self.ctx.enemies
+
+    @property
+    def towers(self):
+        return self.ctx.towers
+
+    @property
+    def bullets(self):
+        return self.ctx.bullets
+
+    @property
+    def level_index(self):
+        return self.ctx.level_index
+
+    @level_index.setter
+    def level_index(self, value):
+        self.ctx.level_index = value
+
+    # ===============================
+    # CONTROLE DE NÍVEL
+    # ===============================
+    def start_level(self, level_index):
+        """(Re)inicia o nível: zera entidades, dinheiro, vidas e o cronograma de ondas."""
+        self.level_index = level_index
+        self.game_state.money = INITIAL_MONEY
+        self.game_state.lives = 10
+        self.enemies.empty()
+        self.towers.empty()
+        self.ctx.bullet_pool.recycle(self.bullets)
+        self.ctx.events.clear()
+        self.progress_index.clear()
+        # Caminho e torres do nível, para validar construção e achar torres
+        self.occupancy = OccupancyGrid(level_index)
+
+        self.level_manager = LevelManager(self.ctx, LEVELS[level_index])
+        self.level_manager.start_level(self.time_ms)
+
+    @property
+    def level_complete(self):
+        """Todas as ondas saíram e não resta inimigo em campo."""
+        return self.level_manager.finished and len(self.enemies) == 0
+
+    @property
+    def game_over(self):
+        return self.game_state.lives <= 0
+
+    # ===============================
+    # AÇÕES DO JOGADOR
+    # ===============================
+    def place_tower(self, tower_class, pos_base):
+        """
+        Compra e posiciona uma torre em `pos_base` (coordenadas base).
+        Retorna a torre criada, ou None se não houver dinheiro ou se o
+        ponto não for livre (caminho, outra torre, fora da tela).
+        A posição é truncada para px base inteiros (como no Recorder), os
+        mesmos que o snapshot grava: cobertura, ocupação e um jogo
+        restaurado enxergam exatamente a mesma torre.
+        """
+        pos_base = (int(pos_base[0]), int(pos_base[1]))
+        cost = tower_class.COST
+        if not self.game_state.can_afford(cost) or not self.occupancy.can_place(*pos_base):
+            return None
+        self.game_state.spend(cost)
+        tower = tower_class(self.ctx, pos_base, self.time_ms)
+        self.towers.add(tower)
+        self.occupancy.add_tower(tower)
+        return tower
+
+    def tower_at(self, pos_base):
+        """Torre sob o ponto `pos_base` (coordenadas base), ou None."""
+        return self.occupancy.tower_at(*pos_base)
+
+    def upgrade_tower(self, tower):
+        """Faz upgrade de `tower` (se houver dinheiro e nível disponível)."""
+        tower.upgrade()
+
+    def set_target_policy(self, tower, policy):
+        """Troca a política de mira de `tower` (uma de towers.TARGET_POLICIES)."""
+        if policy not in TARGET_POLICIES:
+            raise ValueError(f"política de mira desconhecida: {policy}")
+        tower.policy = policy
+
+    # ===============================
+    # PASSO DE SIMULAÇÃO
+    # ===============================
+    def step(self, dt=TICK_MS):
+        """
+        Avança a simulação em um tick de `dt` ms.
+        Velocidades de inimigos e projéteis são em px base por segundo, então
+        o resultado depende só do tempo simulado, não do FPS.
+        """
+        self.time_ms += dt
+        self.tick += 1
+        dt_s = dt / 1000.0
+        timer = self.phase_timer
+        if timer is not None:
+            timer.start()
+
+        self.level_manager.update(self.time_ms)
+
+        if self.enemy_engine is None:
+            self.enemies.update(dt_s)
+        else:
+            self.enemy_engine.step(dt_s)
+        self.progress_index.update(self.enemies)
+        if timer is not None:
+            timer.lap("enemies")
+
+        if self.ctx.bullet_mode == "homing":
+            self.bullets.update(dt_s)
+        # Impactos agendados (modo "intercept"): só os que vencem neste tick
+        for at, (kind, bullet) in self.ctx.events.pop_due(self.time_ms):
+            bullet.impact()
+        if timer is not None:
+            timer.lap("bullets")
+
+        self.towers.update()
+        for torre in self.towers:
+            torre.try_shoot(self.time_ms, progress_index=self.progress_index)
+        if timer is not None:
+            timer.lap("targeting")
+
+    def interpolate(self, alpha):
+        """
+        Posiciona os rects de tela entre o penúltimo e o último estado lógico
+        (alpha = 0 → tick anterior, 1 → tick atual). Só afeta o desenho.
+        """
+        sx, sy = self.ctx.scale_x, self.ctx.scale_y
+        intercept = self.ctx.bullet_mode == "intercept"
+        for group in (self.enemies, self.bullets):
+            if intercept and group is self.bullets:
+                # Projéteis “intercept” não têm estado por tick: posição = f(tempo)
+                t = self.time_ms - (1.0 - alpha) * TICK_MS
+                for bullet in group:
+                    x, y = bullet.position_at(t)
+                    bullet.rect.center = (int(x * sx), int(y * sy))
+                continue
+            for sprite in group:
+                px, py = sprite.prev_pos_base
+                x, y = sprite.pos_base
+                sprite.rect.center = (int((px + (x - px) * alpha) * sx),
+                                      int((py + (y - py) * alpha) * sy))
+
+    def run(self, max_ticks, dt=TICK_MS):
+        """
+        Roda até o nível terminar, as vidas acabarem ou `max_ticks` passarem.
+        Retorna o número de ticks executados.
+        """
+        start = self.tick
+        while self.tick - start < max_ticks:
+            self.step(dt)
+            if self.level_complete or self.game_over:
+                break
+        return self.tick - start
+
+
+class FixedStepper:
+    """
+    Acumulador de passo fixo: converte o tempo real de cada frame em
+    ticks de TICK_MS da simulação, com limite de ticks de recuperação.
+    `alpha` é a fração do próximo tick já decorrida (para interpolação).
+
+    `speed` multiplica o tempo simulado por frame (2×, 4×, 16×…): como
+    ondas, cooldowns e projéteis seguem o tempo simulado, acelerar não
+    altera o resultado da partida. speed=None roda sem limite.
+    """
+
+    def __init__(self, sim, tick_ms=TICK_MS, max_steps=MAX_CATCHUP_STEPS):
+        self.sim = sim
+        self.tick_ms = tick_ms
+        self.max_steps = max_steps
+        self.accumulator = 0.0
+        self.speed = 1
+
+    @property
+    def uncapped(self):
+        return self.speed is None
+
+    def advance(self, frame_ms):
+        """
+        Acumula `frame_ms` (× speed) e roda os ticks devidos.
+        Retorna quantos rodaram.
+        """
+        if self.uncapped:
+            return self.advance_uncapped()
+
+        self.accumulator += frame_ms * self.speed
+        max_steps = self.max_steps * self.speed
+        steps = 0
+        while self.accumulator >= self.tick_ms and steps < max_steps:
+            self.sim.step(self.tick_ms)
+            self.accumulator -= self.tick_ms
+            steps += 1
+        if self.accumulator >= self.tick_ms:
+            # Atraso além do limite: descarta, o jogo desacelera em vez de travar
+            self.accumulator %= self.tick_ms
+        return steps
+
+    def advance_uncapped(self, budget_ms=UNCAPPED_RENDER_INTERVAL):
+        """
+        Modo sem limite: roda ticks por até `budget_ms` de tempo real (os
+        frames intermediários não são desenhados). Para ao fim do nível.
+        """
+        self.accumulator = 0.0
+        deadline = time.perf_counter() + budget_ms / 1000.0
+        sim = self.sim
+        steps = 0
+        while not sim.level_complete:
+            sim.step(self.tick_ms)
+            steps += 1
+            # Consulta o relógio a cada 32 ticks para não pesar no laço
+            if steps & 31 == 0 and time.perf_counter() >= deadline:
+                break
+        return steps
+
+    @property
+    def alpha(self):
+        return self.accumulator / self.tick_ms
@@ -0,0 +1,309 @@
+# snapshot.py
+#
+# Snapshot binário do estado completo de uma Simulation: GameState, torres,
+# inimigos, projéteis, cronograma de ondas (LevelManager), relógio e o estado
+# do RNG. Restaurar um snapshot e continuar a simulação dá exatamente o mesmo
+# resultado que a partida original — dá para “ramificar” uma partida na
+# onda N e testar outras torres sem rejogar desde o início.
+#
+#     data = snapshot.dumps(sim)          # bytes (memória)
+#     snapshot.loads(data, sim)           # rollback na mesma Simulation
+#     ramo = snapshot.loads(data)         # Simulation nova e independente
+#     snapshot.save(sim, "saves/x.tdsnap"); snapshot.load("saves/x.tdsnap", sim)
+#
+# Formato (little-endian, versionado):
+#     cabeçalho   magic "TDSN", versão, tick, time_ms, nível, dinheiro, vidas, modo dos projéteis
+#     nomes       tabela de nomes de classes (os registros guardam só o índice)
+#     rng         estado do random.Random (624+1 palavras de 32 bits + gauss)
+#     ondas       onda atual, fluxos de spawn e a agenda de eventos (scheduler)
+#     torres / inimigos / projéteis: contagem + registros de tamanho fixo
+
+import os
+import math
+import struct
+from collections import deque
+
+from levels import LevelManager, LEVELS
+from occupancy import OccupancyGrid
+from enemies import BasicEnemy, FastEnemy
+from towers import BasicTower, SniperTower, TARGET_POLICIES
+from bullets import Bullet, BasicBullet, HeavyBullet
+from simulation import Simulation
+
+MAGIC = b"TDSN"
+VERSION = 4
+
+# Classes que podem aparecer num snapshot (por nome)
+CLASSES = {cls.__name__: cls for cls in (
+    BasicEnemy, FastEnemy, BasicTower, SniperTower, Bullet, BasicBullet, HeavyBullet,
+)}
+
+_HEADER = struct.Struct("<4sHIdHqiB")     # magic, versão, tick, time_ms, nível, dinheiro, vidas, modo dos projéteis
+_COUNT = struct.Struct("<I")
+_RNG = struct.Struct("<i625I?d")          # versão, estado MT, tem gauss?, gauss
+_WAVES = struct.Struct("<H?HHIQ")        # onda, finished, fluxos ativos, nº de fluxos, nº de eventos, seq
+_STREAM = struct.Struct("<HId")           # classe, restantes, intervalo
+_EVENT = struct.Struct("<dQBI")           # instante, seq, tipo (0 = spawn, 1 = wave), índice
+_TOWER = struct.Struct("<HiiBiddB")       # classe, x, y (px base inteiros), nível, range, fire_rate, last_shot,
+                                          # política de mira (índice em TARGET_POLICIES)
+_ENEMY = struct.Struct("<HdHidiHdddd")    # classe, distância, segmento, hp, speed, reward, onda, x, y, prev x, prev y
+_BULLET = struct.Struct("<Hddddidi6d")    # classe, x, y, prev x, prev y, dano, speed, índice do alvo (-1 = morto),
+                                          # voo "intercept" (origem, impacto, t0, t1; NaN = homing)
+_NO_FLIGHT = (math.nan,) * 6
+
+
+# Tipos de evento do LevelManager (índice gravado no snapshot)
+_EVENT_KINDS = ("spawn", "wave")
+# Modos de projétil (config.BULLET_MODE) → índice no cabeçalho
+_BULLET_MODES = ("homing", "intercept")
+
+
+class SnapshotError(ValueError):
+    """Dados que não são um snapshot válido (ou de versão incompatível)."""
+
+
+# ===============================
+# SERIALIZAÇÃO
+# ===============================
+def dumps(sim):
+    """Serializa o estado completo de `sim` em bytes."""
+    gs = sim.game_state
+    lm = sim.level_manager
+    towers = sim.towers.sprites()
+    enemies = sim.enemies.sprites()
+    bullets = sim.bullets.sprites()
+
+    names = []
+    ids = {}
+
+    def class_id(obj):
+        name = type(obj).__name__ if not isinstance(obj, type) else obj.__name__
+        if name not in ids:
+            ids[name] = len(names)
+            names.append(name)
+        return ids[name]
+
+    enemy_pos = {enemy: i for i, enemy in enumerate(enemies)}
+
+    body = bytearray()
+    body += _COUNT.pack(len(towers))
+    for t in towers:
+        body += _TOWER.pack(class_id(t), t.pos_base[0], t.pos_base[1], t.level,
+                            t.range, t.fire_rate, t.last_shot, TARGET_POLICIES.index(t.policy))
+    body += _COUNT.pack(len(enemies))
+    for e in enemies:
+        px, py = e.prev_pos_base
+        body += _ENEMY.pack(class_id(e), e.distance, e.segment, e.hp, e.speed, e.reward,
+                            e.wave, e.pos_base[0], e.pos_base[1], px, py)
+    body += _COUNT.pack(len(bullets))
+    for b in bullets:
+        px, py = b.prev_pos_base
+        body += _BULLET.pack(class_id(b), b.pos_base[0], b.pos_base[1], px, py,
+                             b.damage, b.speed, enemy_pos.get(b.target, -1),
+                             *(b.flight if b.flight is not None else _NO_FLIGHT))
+
+    entries = lm.scheduler.entries()
+    waves = bytearray(_WAVES.pack(lm.current_wave, lm.finished, lm.active_streams,
+                                  len(lm.streams), len(entries), lm.scheduler.seq))
+    for EnemyClass, remaining, interval in lm.streams:
+        waves += _STREAM.pack(class_id(EnemyClass), remaining, interval)
+    for at, seq, (kind, index) in entries:
+        waves += _EVENT.pack(at, seq, _EVENT_KINDS.index(kind), index)
+
+    rng_version, mt, gauss = sim.rng.getstate()
+    rng = _RNG.pack(rng_version, *mt, gauss is not None, gauss if gauss is not None else 0.0)
+
+    table = bytearray(struct.pack("<H", len(names)))
+    for name in names:
+        raw = name.encode("utf-8")
+        table += struct.pack("<B", len(raw)) + raw
+
+    header = _HEADER.pack(MAGIC, VERSION, sim.tick, sim.time_ms, sim.level_index, gs.money, gs.lives,
+                          _BULLET_MODES.index(sim.ctx.bullet_mode))
+    return b"".join((header, table, rng, waves, body))
+
+
+def loads(data, sim=None):
+    """
+    Restaura um snapshot. Com `sim`, sobrescreve o estado dessa Simulation
+    (rollback); sem ele, cria uma Simulation nova. Retorna a Simulation.
+    """
+    view = memoryview(data)
+    if len(view) < _HEADER.size:
+        raise SnapshotError("snapshot truncado")
+    magic, version, tick, time_ms, level_index, money, lives, mode = _HEADER.unpack_from(view, 0)
+    if magic != MAGIC:
+        raise SnapshotError("não é um snapshot do jogo")
+    if version < VERSION:
+        raise SnapshotError(f"snapshot na versão {version}, de uma versão anterior do jogo "
+                            f"(esta lê a versão {VERSION}); salvos antigos não são convertidos")
+    if version > VERSION:
+        raise SnapshotError(f"snapshot na versão {version}, de uma versão mais nova do jogo "
+                            f"(esta lê até a versão {VERSION})")
+    offset = _HEADER.size
+
+    (count,) = struct.unpack_from("<H", view, offset)
+    offset += 2
+    classes = []
+    for _ in range(count):
+        size = view[offset]
+        name = bytes(view[offset + 1:offset + 1 + size]).decode("utf-8")
+        offset += 1 + size
+        if name not in CLASSES:
+            raise SnapshotError(f"classe desconhecida no snapshot: {name}")
+        classes.append(CLASSES[name])
+
+    rng_fields = _RNG.unpack_from(view, offset)
+    offset += _RNG.size
+    wave, finished, active, num_streams, num_events, seq = _WAVES.unpack_from(view, offset)
+    offset += _WAVES.size
+    streams = [[classes[cid], remaining, interval] for cid, remaining, interval in
+               _STREAM.iter_unpack(view[offset:offset + num_streams * _STREAM.size])]
+    offset += num_streams * _STREAM.size
+    events = [(at, event_seq, (_EVENT_KINDS[kind], index)) for at, event_seq, kind, index in
+              _EVENT.iter_unpack(view[offset:offset + num_events * _EVENT.size])]
+    offset += num_events * _EVENT.size
+
+    if sim is None:
+        sim = Simulation(level_index)
+    gs = sim.game_state
+    sim.tick = tick
+    sim.time_ms = time_ms
+    sim.level_index = level_index
+    sim.ctx.bullet_mode = _BULLET_MODES[mode]
+    gs.money = money
+    gs.lives = lives
+    sim.enemies.empty()
+    sim.towers.empty()
+    sim.ctx.bullet_pool.recycle(sim.bullets)
+    sim.ctx.events.clear()
+
+    sim.occupancy = OccupancyGrid(level_index)
+    lm = LevelManager(sim.ctx, LEVELS[level_index])
+    lm.current_wave = wave
+    lm.finished = finished
+    lm.active_streams = active
+    lm.streams = streams
+    lm.scheduler.restore(events, seq)
+    sim.level_manager = lm
+
+    # Torres passam pelo construtor (imagens/rects como no jogo); o estado
+    # lógico é sobrescrito em seguida com os valores gravados.
+    (count,) = _COUNT.unpack_from(view, offset)
+    offset += _COUNT.size
+    for cid, x, y, level, rng_range, fire_rate, last_shot, policy in _TOWER.iter_unpack(
+            view[offset:offset + count * _TOWER.size]):
+        tower = classes[cid](sim.ctx, (x, y), last_shot)
+        tower.level = level
+        if rng_range != tower.range:
+            tower.range = rng_range
+            tower.update_coverage()
+        tower.fire_rate = fire_rate
+        tower.policy = TARGET_POLICIES[policy]
+        sim.towers.add(tower)
+        sim.occupancy.add_tower(tower)
+    offset += count * _TOWER.size
+
+    (count,) = _COUNT.unpack_from(view, offset)
+    offset += _COUNT.size
+    # Inimigos são milhares: Enemy.blank() pula o construtor, e caminho e
+    # imagem saem de um inimigo construído uma vez por classe
+    looks = {}
+    enemies = []
+    for cid, distance, segment, hp, speed, reward, wave_i, x, y, px, py in _ENEMY.iter_unpack(
+            view[offset:offset + count * _ENEMY.size]):
+        cls = classes[cid]
+        look = looks.get(cls)
+        if look is None:
+            model = cls(sim.ctx)
+            look = looks[cls] = (model.path, model.image)
+        enemy = cls.blank(sim.ctx, *look)
+        enemy.distance = distance
+        enemy.segment = segment
+        enemy.hp = hp
+        enemy.speed = speed
+        enemy.reward = reward
+        enemy.wave = wave_i
+        enemy.pos_base = [x, y]
+        enemy.prev_pos_base = (px, py)
+        enemies.append(enemy)
+    sim.enemies.add(enemies)
+    offset += count * _ENEMY.size
+
+    (count,) = _COUNT.unpack_from(view, offset)
+    offset += _COUNT.size
+    dead_target = None
+    for cid, x, y, px, py, damage, speed, target, *flight in _BULLET.iter_unpack(
+            view[offset:offset + count * _BULLET.size]):
+        if target < 0:
+            # Alvo já morto: um sprite fora de qualquer grupo (alive() == False)
+            if dead_target is None:
+                dead_target = BasicEnemy(sim.ctx)
+            target = dead_target
+        else:
+            target = enemies[target]
+        # Pelo pool, como um tiro; acima da capacidade, um projétil avulso
+        bullet = sim.ctx.bullet_pool.acquire(classes[cid], (x, y), target)
+        if bullet is None:
+            bullet = classes[cid](sim.ctx, (x, y), target)
+        bullet.prev_pos_base = (px, py)
+        bullet.damage = damage
+        bullet.speed = speed
+        # pending_damage dos inimigos é derivado dos projéteis em voo
+        bullet.reserve()
+        if not math.isnan(flight[5]):
+            # Impacto “intercept” pendente: volta para a agenda da partida
+            bullet.flight = tuple(flight)
+            sim.ctx.events.schedule(flight[5], ("impact", bullet))
+        sim.bullets.add(bullet)
+    offset += count * _BULLET.size
+
+    sim.progress_index.rebuild(sim.enemies)
+    # Por último: os construtores acima consomem o RNG
+    rng_version, *mt, has_gauss, gauss = rng_fields
+    sim.rng.setstate((rng_version, tuple(mt), gauss if has_gauss else None))
+    return sim
+
+
+def save(sim, path):
+    folder = os.path.dirname(path)
+    if folder:
+        os.makedirs(folder, exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(dumps(sim))
+
+
+def load(path, sim=None):
+    with open(path, "rb") as f:
+        return loads(f.read(), sim)
+
+
+class SnapshotHistory:
+    """
+    Snapshots em memória para rollback: guarda os últimos `capacity`
+    estados (bytes) e restaura qualquer um deles na Simulation.
+    """
+
+    def __init__(self, capacity=32):
+        self.snapshots = deque(maxlen=capacity)
+
+    def __len__(self):
+        return len(self.snapshots)
+
+    def take(self, sim):
+        """Guarda o estado atual; retorna (tick, bytes)."""
+        entry = (sim.tick, dumps(sim))
+        self.snapshots.append(entry)
+        return entry
+
+    def rollback(self, sim, steps=1):
+        """
+        Volta `sim` ao snapshot de `steps` posições atrás (1 = o mais recente).
+        Os snapshots mais novos que ele são descartados.
+        """
+        if not 1 <= steps <= len(self.snapshots):
+            raise IndexError("não há snapshots suficientes para este rollback")
+        for _ in range(steps - 1):
+            self.snapshots.pop()
+        tick, data = self.snapshots[-1]
+        return loads(data, sim)
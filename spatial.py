@@ -0,0 +1,170 @@
+# spatial.py
+
+from bisect import bisect_left, bisect_right
+from operator import attrgetter
+
+from config import SPATIAL_CELL_SIZE
+
+_distance = attrgetter("distance")
+
+
+class SpatialHash:
+    """
+    Grade uniforme sobre as posições base (pos_base) dos inimigos: uma
+    consulta só visita as células que cruzam o círculo pedido.
+
+    A mira das torres não usa mais esta grade: todas as políticas, inclusive
+    "closest", passam pelo ProgressIndex e pela cobertura de cada torre
+    (Tower.coverage). A grade fica para benchmarks/bench_spatial.py, que a
+    compara com a busca por força bruta.
+    """
+
+    def __init__(self, cell_size=SPATIAL_CELL_SIZE):
+        self.cell_size = max(int(cell_size), 1)
+        self._cells = {}     # (cx, cy) -> {sprite: None} (dict mantém ordem de inserção)
+        self._cell_of = {}   # sprite -> (cx, cy)
+
+    def __len__(self):
+        return len(self._cell_of)
+
+    def _key(self, x, y):
+        return (int(x // self.cell_size), int(y // self.cell_size))
+
+    def clear(self):
+        self._cells.clear()
+        self._cell_of.clear()
+
+    def rebuild(self, sprites):
+        """Reconstrói a grade do zero a partir de `sprites`."""
+        self.clear()
+        cells = self._cells
+        cell_of = self._cell_of
+        for sprite in sprites:
+            key = self._key(*sprite.pos_base)
+            bucket = cells.get(key)
+            if bucket is None:
+                bucket = cells[key] = {}
+            bucket[sprite] = None
+            cell_of[sprite] = key
+
+    def update(self, sprites):
+        """
+        Atualização incremental: só move de célula quem trocou de célula
+        e remove quem não está mais em `sprites` (morto ou que escapou).
+        """
+        cells = self._cells
+        cell_of = self._cell_of
+        seen = set()
+        for sprite in sprites:
+            seen.add(sprite)
+            key = self._key(*sprite.pos_base)
+            old = cell_of.get(sprite)
+            if old == key:
+                continue
+            if old is not None:
+                self._discard(sprite, old)
+            bucket = cells.get(key)
+            if bucket is None:
+                bucket = cells[key] = {}
+            bucket[sprite] = None
+            cell_of[sprite] = key
+
+        if len(seen) != len(cell_of):
+            for sprite in [s for s in cell_of if s not in seen]:
+                self._discard(sprite, cell_of.pop(sprite))
+
+    def _discard(self, sprite, key):
+        bucket = self._cells.get(key)
+        if bucket is not None:
+            bucket.pop(sprite, None)
+            if not bucket:
+                del self._cells[key]
+
+    def query(self, x, y, radius):
+        """
+        Gera (sprite, distância²) para cada sprite vivo a até `radius` de (x, y).
+        Só as células que cruzam o quadrado envolvente do círculo são visitadas.
+        """
+        r2 = radius * radius
+        cs = self.cell_size
+        x0, y0 = int((x - radius) // cs), int((y - radius) // cs)
+        x1, y1 = int((x + radius) // cs), int((y + radius) // cs)
+        cells = self._cells
+        for cx in range(x0, x1 + 1):
+            for cy in range(y0, y1 + 1):
+                bucket = cells.get((cx, cy))
+                if not bucket:
+                    continue
+                for sprite in bucket:
+                    if not sprite.alive():
+                        continue
+                    sx, sy = sprite.pos_base
+                    dx = sx - x
+                    dy = sy - y
+                    d2 = dx * dx + dy * dy
+                    if d2 <= r2:
+                        yield sprite, d2
+
+
+class ProgressIndex:
+    """
+    Inimigos ordenados pelo progresso no caminho (enemy.distance, crescente).
+    update() só marca o índice como desatualizado; a reordenação acontece na
+    primeira consulta do tick. Como a ordem quase não muda de um tick para o
+    outro (só ultrapassagens e inimigos novos no início), reordenar a lista
+    anterior custa ~O(n) (Timsort em dados quase ordenados).
+
+    window(d0, d1) devolve, por busca binária, a faixa de `sprites` cujo
+    progresso está em [d0, d1] — as torres visitam só o trecho do caminho
+    ao seu alcance, já na ordem de progresso.
+    """
+
+    def __init__(self):
+        self.sprites = []   # ordem crescente de distância
+        self._keys = []     # distâncias correspondentes (para bisect)
+        self._source = ()
+        self._dirty = False
+
+    def __len__(self):
+        self._refresh()
+        return len(self.sprites)
+
+    def clear(self):
+        self.sprites = []
+        self._keys = []
+        self._source = ()
+        self._dirty = False
+
+    def rebuild(self, sprites):
+        """Descarta a ordem anterior e indexa `sprites` do zero."""
+        self.clear()
+        self.update(sprites)
+
+    def update(self, sprites):
+        """Chamado 1× por tick, depois de enemies.update()."""
+        self._source = sprites
+        self._dirty = True
+
+    def _refresh(self):
+        if not self._dirty:
+            return
+        self._dirty = False
+        source = self._source
+        # Num Group do pygame, o próprio dicionário de membros responde "s in"
+        # sem copiar o grupo a cada tick; outro iterável vira um set
+        members = getattr(source, "spritedict", None)
+        if members is None:
+            members = set(source)
+        order = [s for s in self.sprites if s in members]
+        if len(order) != len(members):
+            known = set(order)
+            order.extend(s for s in source if s not in known)
+        order.sort(key=_distance)
+        self.sprites = order
+        self._keys = [s.distance for s in order]
+
+    def window(self, d0, d1):
+        """(lo, hi): sprites[lo:hi] são os inimigos com d0 <= distance <= d1."""
+        self._refresh()
+        keys = self._keys
+        return bisect_left(keys, d0), bisect_right(keys, d1)
@@ -0,0 +1,130 @@
+# sprite_cache.py
+
+import pygame
+import config
+
+# —––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––—
+# CACHE CENTRAL DE SPRITES
+# Cada arquivo é lido e decodificado UMA vez; as versões escaladas
+# ficam guardadas por (arquivo, tamanho). Quando o SCALE muda
+# (config.update_screen_size), as entradas do tamanho antigo são descartadas.
+# O cache é do processo: todas as partidas (GameContext) compartilham as
+# mesmas imagens decodificadas, cada uma pedindo o tamanho da sua escala.
+# —––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––––—
+
+_sources = {}   # path -> Surface original (decodificada)
+_base = {}      # (path, base_size) -> Surface em tamanho base (1536×1024)
+_scaled = {}    # (path, size) -> Surface no tamanho da tela atual
+_circles = {}   # (color, size) -> Surface de fallback (círculo)
+_cache_scale = None
+
+
+def _check_scale():
+    """Descarta as superfícies escaladas se o SCALE mudou desde o último acesso."""
+    global _cache_scale
+    if _cache_scale != config.SCALE:
+        _scaled.clear()
+        _circles.clear()
+        _cache_scale = config.SCALE
+
+
+def screen_size(base_size: int, scale=None) -> int:
+    """
+    Converte um tamanho em px da base 1536×1024 para px de tela.
+    scale: escala do contexto; None usa config.SCALE (janela atual).
+    """
+    if scale is None:
+        scale = config.SCALE
+    return max(int(base_size * scale), 1)
+
+
+def get_source(path: str) -> pygame.Surface:
+    """
+    Retorna a imagem original de `path`, decodificando-a só na primeira vez.
+    Sem janela (simulação headless) não há modo de vídeo para convert_alpha();
+    a imagem fica no formato em que foi decodificada.
+    """
+    img = _sources.get(path)
+    if img is None:
+        img = pygame.image.load(path)
+        if pygame.display.get_init() and pygame.display.get_surface() is not None:
+            img = img.convert_alpha()
+        _sources[path] = img
+    return img
+
+
+def add_source(path: str, img: pygame.Surface) -> pygame.Surface:
+    """
+    Registra uma imagem já decodificada em outro lugar (ex.: pela thread de
+    level_assets) como o original de `path`. Deve ser chamada na thread
+    principal: o convert_alpha() depende do modo de vídeo. Se `path` já
+    estiver no cache, a versão existente é mantida.
+    """
+    if path in _sources:
+        return _sources[path]
+    if pygame.display.get_init() and pygame.display.get_surface() is not None:
+        img = img.convert_alpha()
+    _sources[path] = img
+    return img
+
+
+def get_sprite(path: str, base_size: int, scale=None) -> pygame.Surface:
+    """
+    Retorna o sprite `path` escalado para (base_size × scale); scale=None
+    usa config.SCALE.
+    Assim como antes, a imagem passa primeiro pelo tamanho base e depois
+    pelo tamanho de tela; as duas etapas ficam em cache.
+    A Surface retornada é compartilhada: não desenhe sobre ela.
+    """
+    _check_scale()
+    size = screen_size(base_size, scale)
+    key = (path, size)
+    img = _scaled.get(key)
+    if img is None:
+        base_key = (path, base_size)
+        base_img = _base.get(base_key)
+        if base_img is None:
+            base_img = pygame.transform.scale(get_source(path), (base_size, base_size))
+            _base[base_key] = base_img
+        img = pygame.transform.scale(base_img, (size, size))
+        _scaled[key] = img
+    return img
+
+
+def get_circle(color, size: int) -> pygame.Surface:
+    """Círculo preenchido de diâmetro `size` (px de tela), usado como placeholder."""
+    _check_scale()
+    key = (tuple(color), size)
+    img = _circles.get(key)
+    if img is None:
+        img = pygame.Surface((size, size), pygame.SRCALPHA)
+        pygame.draw.circle(img, color, (size // 2, size // 2), size // 2)
+        _circles[key] = img
+    return img
+
+
+def evict_stale():
+    """Chamado após update_screen_size: libera já as superfícies do tamanho antigo."""
+    _check_scale()
+
+
+def discard(path: str):
+    """
+    Esquece todas as versões de `path` (original, base e escaladas). Sprites
+    já criados seguem com a Surface que receberam; um novo pedido decodifica
+    o arquivo de novo.
+    """
+    _sources.pop(path, None)
+    for cache in (_base, _scaled):
+        for key in [key for key in cache if key[0] == path]:
+            del cache[key]
+
+
+def clear():
+    """Esvazia o cache por completo (inclusive as imagens decodificadas)."""
+    global _cache_scale
+    _sources.clear()
+    _base.clear()
+    _scaled.clear()
+    _circles.clear()
+    _cache_scale = None
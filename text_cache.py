@@ -0,0 +1,44 @@
+# text_cache.py
+
+from collections import OrderedDict
+from config import TEXT_CACHE_SIZE
+
+
+class TextCache:
+    """
+    Cache LRU de superfícies de texto, chaveado por (texto, cor, tamanho da fonte).
+    Um mesmo texto (ex.: “x 150” no HUD) só passa pelo freetype na primeira
+    vez; as entradas menos usadas são descartadas acima de `max_entries`.
+    """
+
+    def __init__(self, max_entries=TEXT_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def render(self, font, text, color):
+        """Retorna a Surface de `text` renderizado com `font` (pygame.freetype.Font)."""
+        key = (text, tuple(color), font.size)
+        surf = self._entries.get(key)
+        if surf is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return surf
+
+        self.misses += 1
+        surf, _ = font.render(text, color)
+        self._entries[key] = surf
+        if len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return surf
+
+    def blit(self, surface, font, pos, text, color):
+        """Equivalente a font.render_to(surface, pos, text, color), usando o cache."""
+        return surface.blit(self.render(font, text, color), pos)
+
+    def clear(self):
+        self._entries.clear()
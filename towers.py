@@ -1,68 +1,188 @@
 # towers.py
 
 import pygame
-import math
-from config import TOWER_COSTS, UPGRADE_COSTS, SCALE, SCALE_X, SCALE_Y, TOWER_BASE_SIZE
+import paths
+from bisect import bisect_right
+from config import TOWER_COSTS, UPGRADE_COSTS, TOWER_BASE_SIZE, DEFAULT_TARGET_POLICY
 from bullets import BasicBullet
-from game_state import game_state
+
+# Políticas de mira (ordem usada pela tecla T para alternar)
+TARGET_POLICIES = ("first", "last", "strongest", "weakest", "closest")
+
+# Chave de cada política: o alvo é o inimigo em range com a MAIOR chave.
+# Empates de HP ficam com o mais adiantado no caminho.
+_POLICY_KEYS = {
+    "first":     lambda e: e.distance,
+    "last":      lambda e: -e.distance,
+    "strongest": lambda e: (e.hp, e.distance),
+    "weakest":   lambda e: (-e.hp, e.distance),
+}
 
 class Tower(pygame.sprite.Sprite):
     # Cada subtipo define seu próprio BASE_RANGE (em px na base 1536×1024)
     BASE_RANGE = 100
 
-    def __init__(self, pos_base):
+    def __init__(self, ctx, pos_base, now=0):
         """
+        ctx: GameContext da partida (GameState que paga os upgrades, grupos, escala).
         pos_base: (x, y) em coordenadas base (1536×1024) onde o jogador clicou.
+        now: tempo de simulação (ms) no momento da construção.
         """
         super().__init__()
+        self.ctx = ctx
         self.pos_base = list(pos_base)
         self.level = 1
 
-        # Carrega “tower_basic.png” (digamos 32×32), redimensiona para (TOWER_BASE_SIZE × TOWER_BASE_SIZE)
-        img = pygame.image.load("assets/tower_basic.png").convert_alpha()
-        img = pygame.transform.scale(img, (TOWER_BASE_SIZE, TOWER_BASE_SIZE))
-        # Agora redimensiona para a tela: (int(TOWER_BASE_SIZE×SCALE) × int(TOWER_BASE_SIZE×SCALE))
-        size = max(int(TOWER_BASE_SIZE * SCALE), 1)
-        self.image = pygame.transform.scale(img, (size, size))
+        # “tower_basic.png” vem do cache já escalado para (TOWER_BASE_SIZE × SCALE)
+        self.image = ctx.sprite("assets/tower_basic.png", TOWER_BASE_SIZE)
         self.rect = self.image.get_rect()
         self._update_rect()
 
         self.cost = TOWER_COSTS[self.__class__.__name__]
-        self.range = int(self.BASE_RANGE * SCALE)
+        # Range em px base: a lógica não depende do tamanho da janela
+        self.range = self.BASE_RANGE
 
-        # Fire rate (ms) e temporizador
-        self.fire_rate = 1000
-        self.last_shot = pygame.time.get_ticks()
+        # Fire rate (disparos por segundo de simulação) e instante do último tiro (ms)
+        self.fire_rate = 1.0
+        self.last_shot = now
+
+        # Política de mira (TARGET_POLICIES); pode mudar durante a partida
+        self.policy = DEFAULT_TARGET_POLICY
+        # Trechos do caminho dentro do range: [(d0, d1), …] em distância percorrida
+        self.update_coverage()
 
     def _update_rect(self):
         """Atualiza self.rect.center conforme pos_base convertido para tela."""
-        real_x = int(self.pos_base[0] * SCALE_X)
-        real_y = int(self.pos_base[1] * SCALE_Y)
-        self.rect.center = (real_x, real_y)
+        self.rect.center = self.ctx.to_screen(self.pos_base[0], self.pos_base[1])
 
     def update(self):
         # Toda vez que for chamado update(), reposiciona o rect (se SCALE mudou)
         self._update_rect()
 
-    def try_shoot(self, enemies_group, bullets_group):
-        """Procura inimigo mais próximo dentro do range e dispara, respeitando fire_rate."""
-        now = pygame.time.get_ticks()
-        if now - self.last_shot < self.fire_rate:
-            return
+    def update_coverage(self):
+        """
+        Recalcula self.coverage: os intervalos de distância percorrida do
+        caminho que passam dentro do range (PathTable.coverage). Torre e
+        caminho não se movem, então só é chamado na construção e quando o
+        range muda (upgrade). `coverage_starts` serve à busca binária.
+        """
+        table = paths.get_path_table(self.ctx.level_index)
+        self.coverage = table.coverage(self.pos_base[0], self.pos_base[1], self.range)
+        self.coverage_starts = [d0 for d0, _ in self.coverage]
+
+    def covers(self, distance):
+        """True se um inimigo em `distance` no caminho está dentro do range."""
+        i = bisect_right(self.coverage_starts, distance) - 1
+        return i >= 0 and distance <= self.coverage[i][1]
+
+    def find_target(self, enemies_group, progress_index=None):
+        """
+        Retorna o alvo dentro do range segundo self.policy (ou None):
+        "first"/"last" = mais adiantado/atrasado no caminho, "strongest"/
+        "weakest" = mais/menos HP, "closest" = mais próximo da torre.
+        Inimigos cujo HP já está coberto por projéteis em voo
+        (hp <= pending_damage) são ignorados: o tiro vai para o próximo
+        alvo em vez de sobrar.
+
+        Estar no range é um teste de intervalo sobre o progresso do inimigo
+        no caminho (self.coverage), sem distância euclidiana. Com
+        `progress_index` (spatial.ProgressIndex) só os inimigos dos trechos
+        cobertos são visitados, já em ordem de progresso — também para
+        "closest", que só mede a distância até a torre desses candidatos.
+        Sem ele, "closest" percorre o grupo inteiro por distância
+        euclidiana (_find_closest), e as demais políticas percorrem o grupo
+        testando a cobertura.
+        """
+        if self.policy == "closest":
+            if progress_index is None:
+                return self._find_closest(enemies_group)
+            key = self._closest_key()
+        else:
+            key = _POLICY_KEYS[self.policy]
+
+        if progress_index is not None:
+            # Tudo o que cai nos trechos cobertos está em range:
+            # "first"/"last" devolvem o primeiro inimigo vivo encontrado.
+            # As janelas vêm antes de ler .sprites: window() reordena o
+            # índice (uma vez por tick) e troca a lista
+            windows = [progress_index.window(d0, d1) for d0, d1 in self.coverage]
+            sprites = progress_index.sprites
+            if self.policy == "last":
+                candidates = (sprites[i] for lo, hi in windows for i in range(lo, hi))
+            else:
+                candidates = (sprites[i] for lo, hi in reversed(windows) for i in range(hi - 1, lo - 1, -1))
+            if self.policy in ("first", "last"):
+                for enemy in candidates:
+                    if enemy.hp > enemy.pending_damage:
+                        return enemy
+                return None
+        else:
+            covers = self.covers
+            candidates = (e for e in enemies_group if covers(e.distance))
 
-        real_center = self.rect.center
         target = None
-        min_dist = float("inf")
+        best = None
+        for enemy in candidates:
+            if enemy.hp <= enemy.pending_damage:
+                continue
+            k = key(enemy)
+            if target is None or k > best:
+                target = enemy
+                best = k
+        return target
+
+    def _closest_key(self):
+        """Chave de "closest" sobre os candidatos da cobertura: menor distância² até a torre."""
+        cx, cy = self.pos_base
+
+        def key(enemy):
+            ex, ey = enemy.pos_base
+            dx = ex - cx
+            dy = ey - cy
+            return (-(dx * dx + dy * dy), enemy.distance)
+        return key
+
+    def _find_closest(self, enemies_group):
+        """
+        Política "closest" por distância euclidiana, para quem não tem um
+        ProgressIndex: percorre o grupo inteiro.
+        """
+        cx, cy = self.pos_base
+        target = None
+        min_d2 = self.range * self.range
+
         for enemy in enemies_group:
-            ex, ey = enemy.rect.center
-            dist = math.hypot(ex - real_center[0], ey - real_center[1])
-            if dist <= self.range and dist < min_dist:
-                min_dist = dist
+            if enemy.hp <= enemy.pending_damage:
+                continue
+            ex, ey = enemy.pos_base
+            dx = ex - cx
+            dy = ey - cy
+            d2 = dx * dx + dy * dy
+            if d2 <= min_d2 and (target is None or d2 < min_d2):
+                min_d2 = d2
                 target = enemy
+        return target
+
+    def try_shoot(self, now, progress_index=None):
+        """
+        Escolhe um alvo dentro do range (find_target) e dispara, respeitando fire_rate.
+        now: tempo de simulação atual (ms).
+        Os inimigos e os projéteis são os grupos do contexto da torre.
+        """
+        if now - self.last_shot < 1000.0 / self.fire_rate:
+            return
+
+        target = self.find_target(self.ctx.enemies, progress_index)
 
         if target:
-            bullet = BasicBullet(real_center, target)
-            bullets_group.add(bullet)
+            bullet = self.ctx.bullet_pool.acquire(BasicBullet, self.pos_base, target)
+            if bullet is None:
+                return  # pool esgotado: tenta de novo no próximo tick
+            if self.ctx.bullet_mode == "intercept" and not bullet.launch(now):
+                bullet.kill()  # o alvo sai do caminho antes de ser alcançado
+                return
+            bullet.reserve()
+            self.ctx.bullets.add(bullet)
             self.last_shot = now
 
     def upgrade(self):
@@ -76,36 +196,31 @@ class Tower(pygame.sprite.Sprite):
         name = self.__class__.__name__
         if self.level < 3:
             custo = UPGRADE_COSTS[name][self.level - 1]
-            if game_state.can_afford(custo):
-                game_state.spend(custo)
+            if self.ctx.state.can_afford(custo):
+                self.ctx.state.spend(custo)
                 self.level += 1
                 self.range = int(self.range * 1.2)
+                self.update_coverage()
                 # Se quiser trocar sprite para level maior, faça aqui (ex. tower_basic_lv2.png)
-                # img_lv2 = pygame.image.load("assets/tower_basic_lv2.png").convert_alpha()
-                # img_lv2 = pygame.transform.scale(img_lv2, (TOWER_BASE_SIZE, TOWER_BASE_SIZE))
-                # size = max(int(TOWER_BASE_SIZE * SCALE), 1)
-                # self.image = pygame.transform.scale(img_lv2, (size, size))
+                # self.image = self.ctx.sprite("assets/tower_basic_lv2.png", TOWER_BASE_SIZE)
                 # self.rect = self.image.get_rect()
                 # self._update_rect()
 
 class BasicTower(Tower):
     COST = TOWER_COSTS["BasicTower"]
     BASE_RANGE = 100
-    def __init__(self, pos_base):
-        super().__init__(pos_base)
+    def __init__(self, ctx, pos_base, now=0):
+        super().__init__(ctx, pos_base, now)
         # A classe-mãe já carrega “tower_basic.png” e redimensiona
 
 class SniperTower(Tower):
     COST = TOWER_COSTS["SniperTower"]
     BASE_RANGE = 200
-    def __init__(self, pos_base):
-        super().__init__(pos_base)
-        img = pygame.image.load("assets/tower_sniper.png").convert_alpha()
-        img = pygame.transform.scale(img, (TOWER_BASE_SIZE, TOWER_BASE_SIZE))
-        size = max(int(TOWER_BASE_SIZE * SCALE), 1)
-        self.image = pygame.transform.scale(img, (size, size))
+    def __init__(self, ctx, pos_base, now=0):
+        super().__init__(ctx, pos_base, now)
+        self.image = ctx.sprite("assets/tower_sniper.png", TOWER_BASE_SIZE)
         self.rect = self.image.get_rect()
         self._update_rect()
 
-        self.range = int(self.BASE_RANGE * SCALE)
-        self.fire_rate = 1500  # dispara a cada 1.5s
+        self.range = self.BASE_RANGE
+        self.fire_rate = 1 / 1.5  # dispara a cada 1.5s